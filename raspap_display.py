@@ -3,12 +3,27 @@ import sys
 import os
 import time
 import subprocess
+import shlex
 import re
-from PIL import Image, ImageDraw, ImageFont, ImageOps
+import signal
+import errno
+import socket
+import struct
+import fcntl
+from PIL import Image, ImageChops, ImageDraw, ImageFont, ImageOps
 import traceback
+import threading
 import logging
 import requests
+from urllib3.util.retry import Retry
 import json  # Added for VPN connections
+import functools
+from concurrent.futures import ThreadPoolExecutor
+try:
+    import orjson  # Optional; parses bytes directly and faster than json
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 # --- Configure Logging ---
 # For troubleshooting, temporarily change logging.INFO to logging.DEBUG
@@ -25,6 +40,28 @@ if RASPAP_API_KEY is None:
 else:
     logging.info(f"RASPAP_API_KEY loaded. API base URL: {RASPAP_BASE_URL}")
 
+# Keep-alive sessions. The local API retries a 5xx answer once but never a
+# refused connection or read timeout, so a stopped or hung API falls back
+# within API_TIMEOUT (worst case two reads plus backoff, under 5s). GeoIP runs
+# in the background and can afford connection retries too.
+API_TIMEOUT = (1, 2)  # (connect, read) seconds per attempt
+_api_session = requests.Session()
+_api_session.headers.update(
+    {"Accept": "application/json", "access_token": RASPAP_API_KEY or ""})
+_api_session.mount("http://", requests.adapters.HTTPAdapter(
+    pool_connections=1, pool_maxsize=4,
+    max_retries=Retry(total=1, connect=0, read=0, status=1, backoff_factor=0.3,
+                      status_forcelist=(500, 502, 503, 504))))
+_geo_session = requests.Session()
+_geo_session.mount("https://", requests.adapters.HTTPAdapter(
+    pool_connections=1, pool_maxsize=1,
+    max_retries=Retry(total=2, backoff_factor=1,
+                      status_forcelist=(500, 502, 503, 504))))
+_api_executor = ThreadPoolExecutor(max_workers=3)
+# Separate pool for status probes: the hotspot probe itself waits on
+# _api_executor through refresh_api_snapshot().
+_probe_executor = ThreadPoolExecutor(max_workers=3)
+
 script_dir = os.path.dirname(os.path.abspath(__file__))
 lib_parent_path = os.path.join(script_dir, "lib")
 if lib_parent_path not in sys.path:
@@ -56,6 +93,19 @@ except Exception as e:
     logging.critical(
         f"CRITICAL ERROR during driver imports: {e}\n{traceback.format_exc()}")
     sys.exit(1)
+TOUCH_INT_READABLE = bool(TOUCH_INT_PIN and hasattr(
+    tp_config_module, 'digital_read'))
+
+# EPD entry points, resolved once; Waveshare drivers differ in name casing.
+EPD_INIT_FN = getattr(EPD_DRIVER_CLASS, 'init', None) or getattr(
+    EPD_DRIVER_CLASS, 'Init', None)
+EPD_CLEAR_FN = getattr(EPD_DRIVER_CLASS, 'Clear', None) or getattr(
+    EPD_DRIVER_CLASS, 'clear', None)
+EPD_SLEEP_FN = getattr(EPD_DRIVER_CLASS, 'sleep', None)
+EPD_FULL_UPDATE = getattr(EPD_DRIVER_CLASS, 'FULL_UPDATE', 0)
+if not callable(EPD_INIT_FN):
+    logging.critical("EPD driver has no callable init() method.")
+    sys.exit(1)
 
 PHYSICAL_EPD_WIDTH = EPD_DRIVER_CLASS.width if EPD_DRIVER_CLASS and hasattr(
     EPD_DRIVER_CLASS, 'width') else 122
@@ -66,6 +116,7 @@ UI_EPD_HEIGHT = 122
 
 HOST_CONNECTED_VIA_INTERFACE = "wlan0"
 AP_BROADCAST_INTERFACE = "wlan1"
+_IPV4_RE = re.compile(r"inet\s+([\d.]+)/\d+")
 
 # --- Button Layout Configuration ---
 BTN_WIDTH = 80
@@ -125,10 +176,42 @@ VPN_LIST_NAV_BUTTON_AREAS = {
     'back':     (BTN_X, BTN_SLOT_4_Y, BTN_WIDTH, BTN_HEIGHT)
 }
 
+# --- Touch hit map ---
+# Every side button sits in the BTN_X column in one of four slots, so a touch
+# row maps straight to a slot Y (None between slots). On overlapping rows the
+# upper slot wins, matching the old first-match scan.
+_BUTTON_ROW_SLOT = [None] * (UI_EPD_HEIGHT + 1)
+for _slot_y in (BTN_SLOT_1_Y, BTN_SLOT_2_Y, BTN_SLOT_3_Y, BTN_SLOT_4_Y):
+    for _row in range(max(0, _slot_y), min(_slot_y + BTN_HEIGHT, UI_EPD_HEIGHT) + 1):
+        if _BUTTON_ROW_SLOT[_row] is None:
+            _BUTTON_ROW_SLOT[_row] = _slot_y
+
+
+def _buttons_by_slot(areas):
+    return {y: name for name, (_x, y, _w, _h) in areas.items()}
+
+
+MAIN_BUTTONS_BY_SLOT = _buttons_by_slot(BUTTON_AREAS)
+SYSTEM_BUTTONS_BY_SLOT = _buttons_by_slot(SYSTEM_BUTTON_AREAS)
+INFO_BUTTONS_BY_SLOT = _buttons_by_slot(INFO_BUTTON_AREAS)
+VPN_NAV_BUTTONS_BY_SLOT = _buttons_by_slot(VPN_LIST_NAV_BUTTON_AREAS)
+
+
+def _button_at(buttons_by_slot, tx, ty):
+    # Name of the side button under (tx, ty) on the current screen, or None.
+    if not BTN_X <= tx <= BTN_X + BTN_WIDTH or not 0 <= ty <= UI_EPD_HEIGHT:
+        return None
+    return buttons_by_slot.get(_BUTTON_ROW_SLOT[ty])
+
+
 # --- Status & UI State ---
 current_wlan0_connection_status = "INIT"
 current_ap_hotspot_status = "INIT"
 current_vpn_status = "INIT"
+current_host_ssid = None
+current_host_ip = None
+current_ap_ssid = "N/A"
+current_ap_clients = 0
 
 show_system_menu = False
 show_info_screen = False
@@ -136,12 +219,30 @@ show_vpn_menu = False
 info_page = 0
 MAX_INFO_PAGES = 2
 
-touch_cooldown = 0.5
+# Presses are accepted on the touch INT line's press edge; the short cooldown
+# only guards against chatter. Without a readable INT pin there is no edge to
+# track, so the longer cooldown is used instead.
+touch_cooldown = 0.02
+touch_cooldown_no_int = 0.5
 last_button_press = 0
+g_prev_touch_active = False
+g_touch_press_armed = False
+TOUCH_POLL_INTERVAL = 0.1  # Main loop tick while polling for touch
+TOUCH_IDLE_POLL_INTERVAL = 0.3  # Slower polling without INT edges once idle...
+TOUCH_IDLE_AFTER = 5.0  # ...for this many seconds without a touch or redraw
+_last_activity_ts = 0
+_wake_event = threading.Event()  # Wakes the main loop: touch INT edge, status poller, SIGTERM
+_stop_event = threading.Event()  # Set by SIGTERM to leave the main loop
 last_displayed_state = {}
 
 g_ignore_touch_input_temporarily = False
 g_ignore_touch_until_timestamp = 0
+PERIODIC_UPDATE_INTERVAL = 1  # Seconds between status polls on the poller thread
+CPU_TEMP_REDRAW_DELTA = 2.0  # Redraw when CPU temp moves by more than this (°C)
+# Guards publishing the status globals and the UI's snapshot of them. Only
+# held to copy or assign values: probes, sleeps and subprocesses run outside.
+_status_lock = threading.Lock()
+g_net_toggle_pending = None  # "UP"/"DOWN" while the net toggle worker runs
 ACTION_MENU_CHANGE = 2
 ACTION_NORMAL_PRESS = 1
 ACTION_NONE = 0
@@ -149,29 +250,52 @@ ACTION_NONE = 0
 # --- VPN Connection Management ---
 VPN_CONNECTIONS_FILE = "vpn_connections.json"
 available_vpns = []
+_vpn_file_mtime = -1  # mtime of the last parse, None when the file was missing
 current_vpn_config_basename = None
 current_vpn_display_name = None
 
+
+def _resolve_path(*candidates):
+    # First existing path, or None. Only used at import time.
+    for path in candidates:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+assets_dir = os.path.join(script_dir, "assets")
+FONT_B_PATH = _resolve_path(os.path.join(assets_dir, "DejaVuSans-Bold.ttf")
+                            ) or '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf'
+FONT_R_PATH = _resolve_path(os.path.join(assets_dir, "DejaVuSans.ttf")
+                            ) or '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf'
+# Pre-baked 20x20 1-bit, already inverted; raspAP-logo.png is converted on load.
+RASPAP_LOGO_1BIT_PATH = _resolve_path(
+    os.path.join(assets_dir, "raspAP-logo-1bit.png"))
+RASPAP_LOGO_PATH = _resolve_path(os.path.join(assets_dir, "raspAP-logo.png"))
+HOSTAPD_CONF_PATH = _resolve_path("/etc/hostapd/hostapd.conf")
+
 try:
-    assets_dir = os.path.join(script_dir, "assets")
-    font_b_path = os.path.join(assets_dir, "DejaVuSans-Bold.ttf") if os.path.exists(os.path.join(
-        assets_dir, "DejaVuSans-Bold.ttf")) else '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf'
-    font_r_path = os.path.join(assets_dir, "DejaVuSans.ttf") if os.path.exists(os.path.join(
-        assets_dir, "DejaVuSans.ttf")) else '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf'
-    font_l = ImageFont.truetype(font_b_path, 16)
-    font_m = ImageFont.truetype(font_r_path, 13)
-    font_s = ImageFont.truetype(font_r_path, 11)
-    font_t = ImageFont.truetype(font_r_path, 9)
+    font_l = ImageFont.truetype(FONT_B_PATH, 16)
+    font_m = ImageFont.truetype(FONT_R_PATH, 13)
+    font_s = ImageFont.truetype(FONT_R_PATH, 11)
+    font_t = ImageFont.truetype(FONT_R_PATH, 9)
 except IOError:
     logging.warning("DejaVu fonts fail, using default.")
     font_l, font_m, font_s, font_t = (ImageFont.load_default(),)*4
 
 RASPAP_LOGO = None
 try:
-    logo_p = os.path.join(assets_dir, "raspAP-logo.png")
-    if os.path.exists(logo_p):
+    if RASPAP_LOGO_1BIT_PATH:
+        RASPAP_LOGO = Image.open(RASPAP_LOGO_1BIT_PATH)
+        RASPAP_LOGO.load()
+        if RASPAP_LOGO.mode != '1' or RASPAP_LOGO.size != (20, 20):
+            logging.warning(
+                f"{RASPAP_LOGO_1BIT_PATH} is not a 20x20 1-bit image. Ignoring.")
+            RASPAP_LOGO = None
+    if RASPAP_LOGO is None and RASPAP_LOGO_PATH:
         RASPAP_LOGO = ImageOps.invert(Image.open(
-            logo_p).convert("1")).resize((20, 20))
+            RASPAP_LOGO_PATH).convert("1")).resize((20, 20))
+    if RASPAP_LOGO:
         logging.info("RaspAP logo loaded.")
 except Exception as e:
     logging.warning(f"Logo load err: {e}")
@@ -179,113 +303,255 @@ except Exception as e:
 epd_instance = None
 touch_instance = None
 ui_image_buffer = None
+ui_draw = None
 current_gt_dev_data = None
 old_gt_dev_data = None
-system_stats_cache = {'cpu_temp': 0, 'cpu_usage': 0, 'mem_usage': 0, 'uptime': '', 'last_update': 0,
+# All cache timestamps in this module are time.monotonic() values.
+system_stats_cache = {'cpu_temp': 0, 'cpu_usage': 0, 'last_update': 0,
                       # Added last_core_stats_update
-                      'geo_location': 'Unknown', 'last_geo_update': 0, 'last_core_stats_update': 0}
+                      'geo_location': 'Unknown', 'last_geo_update': 0, 'last_core_stats_update': float('-inf'),
+                      # Background GeoIP lookup state
+                      'geo_future': None, 'geo_force': False, 'next_geo_update': 0,
+                      'geo_retry_delay': 0,
+                      # Display strings, formatted once per stats refresh
+                      'cpu_temp_s': "0.0", 'cpu_usage_s': "0.0"}
+
+CORE_STATS_INTERVAL = 5  # CPU temp and usage
+GEOIP_REFRESH_INTERVAL = 86400  # Keep a successful lookup for 24h
+GEOIP_RETRY_MIN = 60  # Failed lookups retry after 1 min, doubling...
+GEOIP_RETRY_MAX = 1800  # ...up to 30 min
+_geo_executor = ThreadPoolExecutor(max_workers=1)
 
 CACHE_AP_SSID_DURATION = 10
 CACHE_AP_CLIENTS_DURATION = 5
-_ap_ssid_cache = {'ssid': None, 'timestamp': 0}
-_ap_clients_cache = {'clients': None, 'timestamp': 0}
+CACHE_PROBE_DURATION = 2  # iwgetid / ip addr / hostapd status probes
+CACHE_API_SNAPSHOT_DURATION = 5
+API_STALE_MAX = 60  # Serve a failed GET from its last good response this long
+_api_last_good = {}  # (url, params) -> (timestamp, response)
+API_SNAPSHOT_ENDPOINTS = {'system': "system", 'ap': "ap",
+                          'clients': f"clients/{AP_BROADCAST_INTERFACE}"}
+_BUTTON_CACHE = {}  # (w, h, label, selected, font) -> pre-rendered button tile
+PARTIAL_REFRESH_MAX_AREA = 0.4  # Max fraction of the panel for a partial refresh
+PARTIAL_REFRESHES_BEFORE_FULL = 10  # Force a full refresh after this many partials
+_last_frame = None  # Copy of the last frame pushed to the EPD
+_partial_refresh_count = 0
+_prev_cpu_times = (0, 0)  # (idle, total) jiffies from the last /proc/stat read
+
+
+def ttl_cache(seconds):
+    # Memoizes results per positional-argument tuple for `seconds`. Callers
+    # may pass the current tick's monotonic time as `now`; it is not part of
+    # the cache key.
+    def decorator(fn):
+        store = {}
+
+        @functools.wraps(fn)
+        def wrapper(*args, now=None):
+            if now is None:
+                now = time.monotonic()
+            hit = store.get(args)
+            if hit is not None and now - hit[0] < seconds:
+                return hit[1]
+            result = fn(*args)
+            store[args] = (now, result)
+            return result
+        wrapper.cache_clear = store.clear
+        return wrapper
+    return decorator
+
+
+@functools.lru_cache(maxsize=256)
+def _measure_text(text, font):
+    # Fonts are loaded once at startup, so (text, font) is a stable cache key.
+    bbox = font.getbbox(text)
+    return bbox[2]-bbox[0], bbox[3]-bbox[1]
 
 
 def get_text_dimensions(draw, text, font):
     if hasattr(font, 'getbbox'):
-        bbox = font.getbbox(text)
-        return bbox[2]-bbox[0], bbox[3]-bbox[1]
+        return _measure_text(text, font)
     if hasattr(draw, 'textbbox'):
         bbox = draw.textbbox((0, 0), text, font=font)
         return bbox[2]-bbox[0], bbox[3]-bbox[1]
     return draw.textsize(text, font=font)
 
 
+# Pre-warm text metrics for every fixed string: header, button labels, the
+# row-height and footer probes and the info page counters.
+_STATIC_TEXTS = (
+    (font_l, ("RaspAP",)),
+    (font_s, ("A", "PREV", "NEXT", "BACK", "SYSTEM", "INFO", "VPN", "UP",
+              "DOWN", "DISCONNECT", "NET ON", "NET OFF", "REBOOT", "SHUTDOWN",
+              "GeoIP: Placeholder", "CPU Temp: Placeholder")),
+    (font_t, tuple(f"Page {p}/{MAX_INFO_PAGES}"
+                   for p in range(1, MAX_INFO_PAGES+1))),
+)
+for _fnt, _txts in _STATIC_TEXTS:
+    if hasattr(_fnt, 'getbbox'):
+        for _txt in _txts:
+            _measure_text(_txt, _fnt)
+
+# --- Pre-rendered Headers ---
+# The logo + "RaspAP" header never changes, so it's rendered once and pasted.
+HEADER_TILE_WIDTH = UI_EPD_WIDTH - BTN_WIDTH - (BTN_MARGIN*2)
+HEADER_TILE_HEIGHT = 30
+
+
+def _build_header_tile(logo_y, text_y, divider_y=None):
+    tile = Image.new('1', (HEADER_TILE_WIDTH, HEADER_TILE_HEIGHT), 255)
+    draw = ImageDraw.Draw(tile)
+    htx = 5
+    if RASPAP_LOGO:
+        draw.bitmap((5, logo_y), RASPAP_LOGO, fill=0)
+        htx = 5+RASPAP_LOGO.width+5
+    draw.text((htx, text_y), "RaspAP", font=font_l, fill=0)
+    if divider_y is not None:
+        draw.line((5, divider_y, UI_EPD_WIDTH - BTN_WIDTH -
+                  (BTN_MARGIN*2) - BTN_MARGIN, divider_y), fill=0)
+    return tile
+
+
+_hdr_txt_h = get_text_dimensions(None, "RaspAP", font_l)[1]
+# Main UI header: 22px band with a divider underneath.
+_HEADER_CACHE = _build_header_tile(
+    max(2, (22-RASPAP_LOGO.height)//2) if RASPAP_LOGO else 0,
+    max(2, (22-_hdr_txt_h)//2), divider_y=22)
+# display_message header: logo at (5, 5), text centred on the logo.
+_MESSAGE_HEADER_CACHE = _build_header_tile(
+    5, 5+(RASPAP_LOGO.height-_hdr_txt_h)//2 if RASPAP_LOGO else 5)
+
+
+def _paste_header(img, header=_HEADER_CACHE):
+    img.paste(header, (0, 0))
+
+
 def call_raspap_api(endpoint, method="GET", json_data=None, params=None):
     if not RASPAP_API_KEY:
         return None
     url = f"{RASPAP_BASE_URL}/{endpoint.lstrip('/')}"
-    headers = {"Accept": "application/json", "access_token": RASPAP_API_KEY}
+    is_get = method.upper() == "GET"
+    cache_key = (url, str(sorted(params.items())) if params else None)
     try:
-        logging.debug(
-            f"API Call: {method} {url} Params: {params} Data: {json_data}")
-        if method.upper() == "GET":
-            resp = requests.get(url, headers=headers, params=params, timeout=5)
+        logging.debug("API Call: %s %s Params: %s Data: %s",
+                      method, url, params, json_data)
+        if is_get:
+            resp = _api_session.get(url, params=params, timeout=API_TIMEOUT)
         elif method.upper() == "POST":
-            resp = requests.post(url, headers=headers,
-                                 json=json_data, params=params, timeout=5)
+            resp = _api_session.post(
+                url, json=json_data, params=params, timeout=API_TIMEOUT)
         else:
             logging.error(f"Unsupported API method: {method}")
             return None
         if resp.status_code == 204 or not resp.content:
             return {"success": True, "status_code": resp.status_code}
         resp.raise_for_status()
-        return resp.json()
+        result = _json_loads(resp.content)
+        if is_get:
+            _api_last_good[cache_key] = (time.monotonic(), result)
+        return result
     except Exception as e:
+        stale = _api_last_good.get(cache_key) if is_get else None
+        if stale and time.monotonic() - stale[0] < API_STALE_MAX:
+            logging.debug(
+                "API Call Error to %s: %s. Using last good response.", url, e)
+            return stale[1]
         logging.warning(f"API Call Error to {url}: {e}")
         return None
 
 
+@ttl_cache(CACHE_API_SNAPSHOT_DURATION)
+def refresh_api_snapshot():
+    # Fetches the system/ap/clients endpoints concurrently, cached as one unit.
+    if not RASPAP_API_KEY:
+        return {}
+    futures = {key: _api_executor.submit(call_raspap_api, endpoint)
+               for key, endpoint in API_SNAPSHOT_ENDPOINTS.items()}
+    data = {key: fut.result() for key, fut in futures.items()}
+    logging.debug("Refreshed API snapshot: %s", list(data))
+    return data
+
+
+@ttl_cache(CACHE_AP_SSID_DURATION)
 def get_cached_ap_ssid():
-    global _ap_ssid_cache
-    now = time.time()
-    if _ap_ssid_cache['ssid'] is not None and (now - _ap_ssid_cache['timestamp'] < CACHE_AP_SSID_DURATION):
-        logging.debug(f"Using cached AP SSID: {_ap_ssid_cache['ssid']}")
-        return _ap_ssid_cache['ssid']
-    ap_details = call_raspap_api("ap")
-    ssid = ap_details.get('ssid', "N/A") if ap_details else "N/A"
-    _ap_ssid_cache['ssid'] = ssid
-    _ap_ssid_cache['timestamp'] = now
-    logging.debug(f"Fetched and cached AP SSID: {ssid}")
+    ap_details = refresh_api_snapshot().get('ap')
+    ssid = ap_details.get(
+        'ssid', "N/A") if ap_details else get_ap_ssid_from_hostapd_conf()
+    logging.debug("Fetched and cached AP SSID: %s", ssid)
     return ssid
 
 
+def get_ap_ssid_from_hostapd_conf():
+    if not HOSTAPD_CONF_PATH:
+        return "N/A"
+    try:
+        with open(HOSTAPD_CONF_PATH, 'r') as f:
+            for line in f:
+                if line.startswith('ssid='):
+                    return line[5:].strip()
+    except OSError as e:
+        logging.debug("hostapd conf read error: %s", e)
+    return "N/A"
+
+
+@ttl_cache(CACHE_AP_CLIENTS_DURATION)
 def get_cached_ap_clients():
-    global _ap_clients_cache
-    now = time.time()
-    if _ap_clients_cache['clients'] is not None and (now - _ap_clients_cache['timestamp'] < CACHE_AP_CLIENTS_DURATION):
-        logging.debug(
-            f"Using cached AP Clients: {_ap_clients_cache['clients']}")
-        return _ap_clients_cache['clients']
-    clients_details = call_raspap_api(f"clients/{AP_BROADCAST_INTERFACE}")
-    clients = len(clients_details['active_clients']
-                  ) if clients_details and 'active_clients' in clients_details else 0
-    _ap_clients_cache['clients'] = clients
-    _ap_clients_cache['timestamp'] = now
-    logging.debug(f"Fetched and cached AP Clients: {clients}")
+    clients_details = refresh_api_snapshot().get('clients')
+    if clients_details and 'active_clients' in clients_details:
+        clients = len(clients_details['active_clients'])
+    else:
+        clients = get_ap_clients_count_via_iw()
+    logging.debug("Fetched and cached AP Clients: %s", clients)
     return clients
 
 
-def run_command(command):
+def exec_command(argv, timeout=15):
+    # Runs argv without a shell; returns (returncode, stdout), -1 on error.
+    if isinstance(argv, str):
+        argv = shlex.split(argv)
+    cmd_str = ' '.join(argv)
     proc = None
     try:
-        logging.debug(f"Executing command: {command}")
-        proc = subprocess.Popen(command, shell=True,
-                                stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, stderr = proc.communicate(timeout=15)
+        logging.debug("Executing command: %s", cmd_str)
+        proc = subprocess.Popen(argv, stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE)
+        stdout, stderr = proc.communicate(timeout=timeout)
         stdout_decoded = stdout.decode('utf-8', errors='replace').strip()
         stderr_decoded = stderr.decode('utf-8', errors='replace').strip()
         if proc.returncode != 0:
-            logging.debug(
-                f"Cmd '{command}' failed ({proc.returncode}). stdout: '{stdout_decoded}', stderr: '{stderr_decoded}'")
-            return ""
-        if not stdout_decoded and proc.returncode == 0:
-            logging.debug(
-                f"Cmd '{command}' ok (0) but no stdout. stderr: '{stderr_decoded}'")
-        return stdout_decoded
+            logging.debug("Cmd '%s' failed (%s). stdout: '%s', stderr: '%s'",
+                          cmd_str, proc.returncode, stdout_decoded, stderr_decoded)
+        elif not stdout_decoded:
+            logging.debug("Cmd '%s' ok (0) but no stdout. stderr: '%s'",
+                          cmd_str, stderr_decoded)
+        return proc.returncode, stdout_decoded
     except subprocess.TimeoutExpired:
-        logging.error(f"Cmd '{command}' timed out.")
+        logging.error(f"Cmd '{cmd_str}' timed out.")
         if proc:
             try:
                 proc.kill()
                 proc.wait(timeout=1)
             except Exception as e_kill:
                 logging.error(
-                    f"Error killing timed-out process for '{command}': {e_kill}")
-        return ""
+                    f"Error killing timed-out process for '{cmd_str}': {e_kill}")
+        return -1, ""
     except Exception as e:
-        logging.error(f"Cmd exec error for '{command}': {e}")
-        logging.debug(traceback.format_exc())
+        logging.error(f"Cmd exec error for '{cmd_str}': {e}")
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(traceback.format_exc())
+        return -1, ""
+
+
+def run_command(argv, timeout=15):
+    returncode, stdout = exec_command(argv, timeout=timeout)
+    return stdout if returncode == 0 else ""
+
+
+def _read_file(path):
+    try:
+        with open(path, 'r') as f:
+            return f.read().strip()
+    except OSError as e:
+        logging.debug("Read error for '%s': %s", path, e)
         return ""
 
 
@@ -298,12 +564,20 @@ def get_vpn_service_name(
 
 
 def load_vpn_connections():
-    global available_vpns
+    # Re-parses the file only when its mtime changed since the last call.
+    global available_vpns, _vpn_file_mtime
     filepath = os.path.join(script_dir, VPN_CONNECTIONS_FILE)
-    if os.path.exists(filepath):
+    try:
+        mtime = os.stat(filepath).st_mtime
+    except OSError:
+        mtime = None
+    if mtime == _vpn_file_mtime:
+        return
+    _vpn_file_mtime = mtime
+    if mtime is not None:
         try:
-            with open(filepath, 'r') as f:
-                loaded_data = json.load(f)
+            with open(filepath, 'rb') as f:
+                loaded_data = _json_loads(f.read())
             if not isinstance(loaded_data, list):
                 logging.error(f"{VPN_CONNECTIONS_FILE} not a JSON list.")
                 available_vpns = []
@@ -313,6 +587,10 @@ def load_vpn_connections():
             for vpn in available_vpns:
                 vpn['config_basename_no_ext'] = get_vpn_config_basename_no_ext(
                     vpn)
+                # Derived once here; the VPN list and status checks reuse them.
+                vpn['_service_name'] = get_vpn_service_name(
+                    vpn['config_basename_no_ext'])
+                vpn['_label'] = vpn['name'][:20]
         except Exception as e:
             logging.error(f"Error loading/parsing {filepath}: {e}")
             available_vpns = []
@@ -321,55 +599,95 @@ def load_vpn_connections():
         available_vpns = []
 
 
-def get_specific_vpn_service_status(service_name_to_check):
-    if not service_name_to_check:
-        logging.error("get_specific_vpn_service_status: No service name.")
-        return "VPN_ERROR"
-    cmd = f"sudo systemctl is-active {service_name_to_check}"
-    status_output = run_command(cmd)
-    if status_output == "active":
+def _vpn_status_from_state(service_name, state):
+    # Maps a unit's ActiveState (from is-active or show) to a VPN status.
+    if state == "active":
         return "VPN_ON"
-    if status_output == "inactive" or status_output == "failed":
+    if state == "inactive" or state == "failed":
         return "VPN_OFF"
-    if status_output == "":
-        logging.warning(f"Cmd '{cmd}' empty. Treating as VPN_ERROR.")
+    if state == "":
+        logging.warning(
+            f"Service '{service_name}' state empty. Treating as VPN_ERROR.")
         return "VPN_ERROR"
     logging.warning(
-        f"Service '{service_name_to_check}' status: '{status_output}'. Treating as VPN_ERROR.")
+        f"Service '{service_name}' status: '{state}'. Treating as VPN_ERROR.")
     return "VPN_ERROR"
 
 
+@ttl_cache(CACHE_PROBE_DURATION)
+def get_specific_vpn_service_status(service_name_to_check):
+    if not service_name_to_check:
+        logging.error("get_specific_vpn_service_status: No service name.")
+        return "VPN_ERROR"
+    # Reading unit state needs no privileges, so skip the sudo fork. The state
+    # is printed even when is-active exits non-zero (3 for inactive).
+    _, status_output = exec_command(
+        ["systemctl", "is-active", service_name_to_check])
+    return _vpn_status_from_state(service_name_to_check, status_output)
+
+
+def get_vpn_unit_states(service_names):
+    # ActiveState of several units from one systemctl call; systemctl prints
+    # one value per unit in argument order, blank-line separated. None means
+    # the output could not be matched up and callers should probe per unit.
+    if not service_names:
+        return {}
+    returncode, output = exec_command(
+        ["systemctl", "show", "-p", "ActiveState", "--value", *service_names])
+    states = [line.strip() for line in output.splitlines() if line.strip()]
+    if returncode != 0 or len(states) != len(service_names):
+        logging.debug("Bulk unit state query unusable (rc %s, %d/%d values).",
+                      returncode, len(states), len(service_names))
+        return None
+    return dict(zip(service_names, states))
+
+
 def update_vpn_status(initial_check=False):
     global current_vpn_status, current_vpn_config_basename, current_vpn_display_name
-    old_status, old_display_name = current_vpn_status, current_vpn_display_name
+    # Probe first; the lock is only taken to publish the outcome.
     if initial_check:
-        current_vpn_status, current_vpn_config_basename, current_vpn_display_name = "VPN_OFF", None, None
+        active_vpn = None
+        unit_states = get_vpn_unit_states(
+            [vpn_def['_service_name'] for vpn_def in available_vpns])
         for vpn_def in available_vpns:
-            svc_name = get_vpn_service_name(vpn_def['config_basename_no_ext'])
-            status = get_specific_vpn_service_status(svc_name)
+            svc_name = vpn_def['_service_name']
+            if unit_states is not None:
+                status = _vpn_status_from_state(svc_name, unit_states[svc_name])
+            else:
+                status = get_specific_vpn_service_status(svc_name)
             if status == "VPN_ON":
-                current_vpn_config_basename, current_vpn_display_name, current_vpn_status = vpn_def[
-                    'config_basename_no_ext'], vpn_def['name'], "VPN_ON"
-                logging.info(
-                    f"Active VPN on startup: {current_vpn_display_name}")
+                active_vpn = vpn_def
                 break
-    elif current_vpn_config_basename:
-        svc_name = get_vpn_service_name(current_vpn_config_basename)
-        actual_status = get_specific_vpn_service_status(svc_name)
-        if actual_status == "VPN_ON":
-            current_vpn_status = "VPN_ON"
-        elif actual_status == "VPN_OFF":
-            current_vpn_status = "VPN_OFF"
-            if old_status == "VPN_ON" and current_vpn_display_name:
-                logging.info(
-                    f"VPN '{current_vpn_display_name}' now OFF. Clearing active VPN.")
-                current_vpn_config_basename, current_vpn_display_name = None, None
-        else:
-            current_vpn_status = "VPN_ERROR"
+        with _status_lock:
+            old_status, old_display_name = current_vpn_status, current_vpn_display_name
+            current_vpn_status, current_vpn_config_basename, current_vpn_display_name = "VPN_OFF", None, None
+            if active_vpn:
+                current_vpn_config_basename, current_vpn_display_name, current_vpn_status = active_vpn[
+                    'config_basename_no_ext'], active_vpn['name'], "VPN_ON"
+        if active_vpn:
+            logging.info(f"Active VPN on startup: {active_vpn['name']}")
     else:
-        current_vpn_status = "VPN_OFF"
-        if not current_vpn_config_basename:
-            current_vpn_display_name = None
+        probed_cfg = current_vpn_config_basename
+        actual_status = get_specific_vpn_service_status(
+            get_vpn_service_name(probed_cfg)) if probed_cfg else None
+        with _status_lock:
+            old_status, old_display_name = current_vpn_status, current_vpn_display_name
+            if old_status in ("VPN_CONNECTING", "VPN_DISCONNECTING") or probed_cfg != current_vpn_config_basename:
+                # connect_vpn()/disconnect_vpn() own the state while they run.
+                pass
+            elif probed_cfg:
+                if actual_status == "VPN_ON":
+                    current_vpn_status = "VPN_ON"
+                elif actual_status == "VPN_OFF":
+                    current_vpn_status = "VPN_OFF"
+                    if old_status == "VPN_ON" and current_vpn_display_name:
+                        logging.info(
+                            f"VPN '{current_vpn_display_name}' now OFF. Clearing active VPN.")
+                        current_vpn_config_basename, current_vpn_display_name = None, None
+                else:
+                    current_vpn_status = "VPN_ERROR"
+            else:
+                current_vpn_status, current_vpn_display_name = "VPN_OFF", None
     if old_status != current_vpn_status or old_display_name != current_vpn_display_name:
         logging.info(
             f"VPN status: {current_vpn_status} (Display: {current_vpn_display_name or 'N/A'})")
@@ -381,49 +699,54 @@ def connect_vpn(vpn_def_to_connect):
         logging.info(f"VPN '{vpn_def_to_connect['name']}' already active.")
         show_vpn_menu = False
         return
-    current_vpn_status = "VPN_CONNECTING"
+    with _status_lock:
+        current_vpn_status = "VPN_CONNECTING"
     display_message(
         f"VPN: Connecting\n{vpn_def_to_connect['name'][:18]}", font_to_use=font_m)
     if current_vpn_config_basename:
         logging.info(
             f"Switching. Disconnecting: {current_vpn_display_name or current_vpn_config_basename}")
         disconnect_vpn(silent=True, called_during_connect=True)
-    new_cfg_base, new_svc_name, new_disp_name = vpn_def_to_connect['config_basename_no_ext'], get_vpn_service_name(
-        vpn_def_to_connect['config_basename_no_ext']), vpn_def_to_connect['name']
+    new_cfg_base, new_svc_name, new_disp_name = vpn_def_to_connect['config_basename_no_ext'], vpn_def_to_connect[
+        '_service_name'], vpn_def_to_connect['name']
     logging.info(f"System: Starting VPN service '{new_svc_name}'...")
-    run_command(f"sudo systemctl start {new_svc_name}")
+    run_command(["sudo", "systemctl", "start", new_svc_name])
     time.sleep(7)
     actual_status = get_specific_vpn_service_status(new_svc_name)
     if actual_status == "VPN_ON":
-        current_vpn_config_basename, current_vpn_display_name, current_vpn_status = new_cfg_base, new_disp_name, "VPN_ON"
+        with _status_lock:
+            current_vpn_config_basename, current_vpn_display_name, current_vpn_status = new_cfg_base, new_disp_name, "VPN_ON"
         logging.info(f"VPN '{new_disp_name}' connected.")
-        update_system_stats(force_geoip_update=True)
+        request_geoip_update()
         show_vpn_menu = False
     else:
         logging.error(
             f"Failed to start/activate '{new_svc_name}'. Status: '{actual_status}'. Check journalctl -u {new_svc_name}")
         display_message(
             f"VPN: Failed\n{new_disp_name[:18]}", font_to_use=font_m)
-        current_vpn_config_basename, current_vpn_display_name = None, None
-        current_vpn_status = "VPN_ERROR" if actual_status == "VPN_ERROR" else "VPN_OFF"
+        with _status_lock:
+            current_vpn_config_basename, current_vpn_display_name = None, None
+            current_vpn_status = "VPN_ERROR" if actual_status == "VPN_ERROR" else "VPN_OFF"
         time.sleep(2)
-    update_vpn_status()
+        update_vpn_status()
 
 
 def disconnect_vpn(silent=False, called_during_connect=False):
     global current_vpn_status, current_vpn_config_basename, current_vpn_display_name
     if not current_vpn_config_basename:
         logging.info("Disconnect VPN: no active VPN.")
-        current_vpn_status = "VPN_OFF"
+        with _status_lock:
+            current_vpn_status = "VPN_OFF"
         return
     svc_name, disp_name_disc = get_vpn_service_name(
         current_vpn_config_basename), current_vpn_display_name or current_vpn_config_basename
-    current_vpn_status = "VPN_DISCONNECTING"
+    with _status_lock:
+        current_vpn_status = "VPN_DISCONNECTING"
     if not silent:
         display_message(
             f"VPN: Disconnecting\n{disp_name_disc[:18]}", font_to_use=font_m)
     logging.info(f"System: Stopping VPN service '{svc_name}'...")
-    run_command(f"sudo systemctl stop {svc_name}")
+    run_command(["sudo", "systemctl", "stop", svc_name])
     time.sleep(3)
     actual_status = get_specific_vpn_service_status(svc_name)
     if actual_status == "VPN_OFF":
@@ -431,51 +754,91 @@ def disconnect_vpn(silent=False, called_during_connect=False):
     else:
         logging.warning(
             f"VPN '{disp_name_disc}' may not have stopped. Status: '{actual_status}'")
-    current_vpn_config_basename, current_vpn_display_name, current_vpn_status = None, None, "VPN_OFF"
+    with _status_lock:
+        current_vpn_config_basename, current_vpn_display_name, current_vpn_status = None, None, "VPN_OFF"
     if not called_during_connect:
-        update_system_stats(force_geoip_update=True)
-        update_vpn_status()
+        request_geoip_update()
 
 
+@ttl_cache(CACHE_PROBE_DURATION)
 def get_ap_hotspot_status_via_api():
-    data = call_raspap_api("system")
+    data = refresh_api_snapshot().get('system')
     if data and isinstance(data, dict):
         return data.get('hostapdStatus') == 1
-    return run_command("sudo systemctl is-active hostapd") == "active"
+    return run_command(["systemctl", "is-active", "hostapd"]) == "active"
+
+
+def get_ap_clients_count_via_iw(interface=AP_BROADCAST_INTERFACE):
+    # Each associated client is one "Station <mac> ..." line.
+    out = run_command(["iw", "dev", interface, "station", "dump"], timeout=5)
+    return out.count("\nStation ") + (1 if out.startswith("Station ") else 0)
 
 
 def update_ap_hotspot_status():
-    global current_ap_hotspot_status
-    old_status = current_ap_hotspot_status
-    current_ap_hotspot_status = "AP_ON" if get_ap_hotspot_status_via_api() else "AP_OFF"
+    global current_ap_hotspot_status, current_ap_ssid, current_ap_clients
+    ap_on = get_ap_hotspot_status_via_api()
+    if ap_on:
+        ap_ssid, ap_clients = get_cached_ap_ssid(), get_cached_ap_clients()
+    with _status_lock:
+        old_status = current_ap_hotspot_status
+        current_ap_hotspot_status = "AP_ON" if ap_on else "AP_OFF"
+        if ap_on:
+            current_ap_ssid, current_ap_clients = ap_ssid, ap_clients
     if old_status != current_ap_hotspot_status:
         logging.info(f"AP Hotspot: {current_ap_hotspot_status}")
 
 
+@ttl_cache(CACHE_PROBE_DURATION)
 def get_host_connected_ssid(interface=HOST_CONNECTED_VIA_INTERFACE):
-    ssid = run_command(f"iwgetid -r {interface}")
+    ssid = run_command(["iwgetid", "-r", interface], timeout=5)
     return ssid if ssid and ssid.strip() else None
 
 
+SIOCGIFADDR = 0x8915
+
+
+def _ioctl_interface_ip(interface_name):
+    # Primary IPv4 address straight from the kernel; raises OSError when the
+    # interface is missing or has no IPv4 address.
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        ifreq = struct.pack('256s', interface_name[:15].encode())
+        res = fcntl.ioctl(sock.fileno(), SIOCGIFADDR, ifreq)
+    return socket.inet_ntoa(res[20:24])
+
+
+@ttl_cache(CACHE_PROBE_DURATION)
 def get_interface_ip(interface_name):
-    ip_output = run_command(f"ip -4 addr show {interface_name}")
+    try:
+        ip_addr = _ioctl_interface_ip(interface_name)
+        if not ip_addr.startswith("127.") and not ip_addr.startswith("169.254."):
+            return ip_addr
+    except OSError as e:
+        if e.errno in (errno.EADDRNOTAVAIL, errno.ENODEV):
+            return None
+        logging.debug("SIOCGIFADDR failed for %s: %s", interface_name, e)
+    # Primary address filtered out (or ioctl unsupported): scan all of them.
+    ip_output = run_command(
+        ["ip", "-4", "addr", "show", interface_name], timeout=5)
     if not ip_output:
         return None
-    for ip_addr in re.findall(r"inet\s+([\d.]+)/\d+", ip_output):
+    for ip_addr in _IPV4_RE.findall(ip_output):
         if not ip_addr.startswith("127.") and not ip_addr.startswith("169.254."):
             return ip_addr
     return None
 
 
 def update_wlan0_connection_status():
-    global current_wlan0_connection_status
-    old_status = current_wlan0_connection_status
-    ip_address = get_interface_ip(HOST_CONNECTED_VIA_INTERFACE)
-    if ip_address:
-        current_wlan0_connection_status = "NET_CONNECTED"
+    global current_wlan0_connection_status, current_host_ssid, current_host_ip
+    host_ip = get_interface_ip(HOST_CONNECTED_VIA_INTERFACE)
+    host_ssid = get_host_connected_ssid(HOST_CONNECTED_VIA_INTERFACE)
+    if host_ip:
+        status = "NET_CONNECTED"
     else:
-        current_wlan0_connection_status = "NET_DISCONNECTED" if not get_host_connected_ssid(
-            HOST_CONNECTED_VIA_INTERFACE) else "NET_ASSOCIATED_NO_IP"
+        status = "NET_DISCONNECTED" if not host_ssid else "NET_ASSOCIATED_NO_IP"
+    with _status_lock:
+        old_status = current_wlan0_connection_status
+        current_host_ip, current_host_ssid = host_ip, host_ssid
+        current_wlan0_connection_status = status
     if old_status != current_wlan0_connection_status:
         logging.info(
             f"Host ({HOST_CONNECTED_VIA_INTERFACE}): {current_wlan0_connection_status}")
@@ -483,48 +846,134 @@ def update_wlan0_connection_status():
 
 def get_external_ip_location():
     try:
-        resp = requests.get(
+        resp = _geo_session.get(
             "https://ipapi.co/json/?fields=city,country_name", timeout=3)
         resp.raise_for_status()
         data = resp.json()
         co, ci = data.get('country_name', '?'), data.get('city', '?')
         return f"{ci}, {co}" if ci != '?' and co != '?' else (co if co != '?' else (ci if ci != '?' else "Unknown"))
-    except:
-        return "Unknown"
+    except Exception as e:
+        logging.debug("GeoIP lookup error: %s", e)
+        return None
+
 
+def read_cpu_usage():
+    # Usage since the previous sample (since boot on the first call).
+    global _prev_cpu_times
+    with open('/proc/stat', 'r') as f:
+        fields = f.readline().split()
+    idle = int(fields[4]) + int(fields[5])
+    total = sum(int(x) for x in fields[1:8])
+    prev_idle, prev_total = _prev_cpu_times
+    _prev_cpu_times = (idle, total)
+    if total == prev_total:
+        return 0.0
+    return 100.0 * (1 - (idle - prev_idle) / (total - prev_total))
+
+
+def update_geoip_location(now, force=False):
+    # The lookup runs on _geo_executor; each call harvests a finished lookup
+    # and schedules the next one (24h on success, backoff on failure).
+    fut = system_stats_cache['geo_future']
+    if fut is not None and fut.done():
+        location = fut.result()
+        system_stats_cache['geo_future'] = fut = None
+        system_stats_cache['last_geo_update'] = now
+        if location is not None:
+            system_stats_cache['geo_location'] = location
+            system_stats_cache['geo_retry_delay'] = 0
+            system_stats_cache['next_geo_update'] = now + GEOIP_REFRESH_INTERVAL
+        else:
+            # Keep the last good location on screen until a lookup succeeds.
+            delay = min(GEOIP_RETRY_MAX, max(GEOIP_RETRY_MIN,
+                        system_stats_cache['geo_retry_delay'] * 2))
+            system_stats_cache['geo_retry_delay'] = delay
+            system_stats_cache['next_geo_update'] = now + delay
+            logging.info(f"GeoIP lookup failed. Retrying in {delay}s.")
+    if force:
+        system_stats_cache['geo_force'] = True
+    if fut is None and (system_stats_cache['geo_force'] or now >= system_stats_cache['next_geo_update']):
+        logging.info(
+            f"Updating GeoIP location... Forced: {system_stats_cache['geo_force']}")
+        system_stats_cache['geo_force'] = False
+        system_stats_cache['geo_future'] = _geo_executor.submit(
+            get_external_ip_location)
 
-def update_system_stats(force_geoip_update=False):
+
+def update_system_stats(force_geoip_update=False, now=None):
     global system_stats_cache
-    now = time.time()
+    if now is None:
+        now = time.monotonic()
 
-    if now - system_stats_cache.get('last_core_stats_update', 0) > 5:
+    if now - system_stats_cache.get('last_core_stats_update', 0) > CORE_STATS_INTERVAL:
+        # Built aside and applied with one update() so readers on the main
+        # thread never see a half-refreshed set of stats.
+        stats = {}
         try:
-            t = run_command("cat /sys/class/thermal/thermal_zone0/temp")
-            system_stats_cache['cpu_temp'] = int(t)/1000 if t else 0
+            t = _read_file("/sys/class/thermal/thermal_zone0/temp")
+            stats['cpu_temp'] = int(t)/1000 if t else 0
         except:
-            system_stats_cache['cpu_temp'] = 0
+            stats['cpu_temp'] = 0
         try:
-            c = run_command("top -bn1 | grep 'Cpu(s)' | awk '{print $2+$4}'")
-            system_stats_cache['cpu_usage'] = float(c) if c else 0
-        except:
-            system_stats_cache['cpu_usage'] = 0
-        system_stats_cache['last_core_stats_update'] = now
+            stats['cpu_usage'] = read_cpu_usage()
+        except Exception:
+            stats['cpu_usage'] = 0
+        stats['cpu_temp_s'] = f"{stats['cpu_temp']:.1f}"
+        stats['cpu_usage_s'] = f"{stats['cpu_usage']:.1f}"
+        stats['last_core_stats_update'] = now
+        system_stats_cache.update(stats)
 
-    if force_geoip_update or (now - system_stats_cache.get('last_geo_update', 0) > 900):
-        logging.info(
-            f"Updating GeoIP location... Forced: {force_geoip_update}")
-        system_stats_cache['geo_location'] = get_external_ip_location()
-        system_stats_cache['last_geo_update'] = now
+    update_geoip_location(now, force_geoip_update)
 
     system_stats_cache['last_update'] = now
 
 
-def display_on_epd(dev, img):
+def request_geoip_update():
+    # Safe from the UI thread: only raises geo_force. Once started, the status
+    # poller is the only caller of update_system_stats() and picks it up on
+    # its next tick.
+    system_stats_cache['geo_force'] = True
+
+
+def display_on_epd(dev, img, full_refresh=False):
+    # Pushes img to the panel. Only the changed area is compared against the
+    # last pushed frame: unchanged frames are skipped, small changes use the
+    # panel's partial refresh, and a full refresh runs every
+    # PARTIAL_REFRESHES_BEFORE_FULL partials to clear ghosting.
+    global _last_frame, _partial_refresh_count
     if not dev:
         logging.warning("EPD instance is None.")
         return
     try:
-        dev.display(dev.getbuffer(img.convert('1')))
+        # ui_image_buffer is created in mode '1'; no per-frame conversion.
+        assert img.mode == '1', f"EPD frame must be mode '1', got {img.mode}"
+        dirty = None
+        if _last_frame is not None:
+            dirty = ImageChops.logical_xor(_last_frame, img).getbbox()
+            if dirty is None and not full_refresh:
+                logging.debug("EPD frame unchanged. Skipping refresh.")
+                return
+        buf = dev.getbuffer(img)
+        dirty_area = (dirty[2]-dirty[0]) * (dirty[3]-dirty[1]) if dirty else 0
+        if (not full_refresh and dirty and hasattr(dev, 'displayPartial')
+                and _partial_refresh_count < PARTIAL_REFRESHES_BEFORE_FULL
+                and dirty_area <= PARTIAL_REFRESH_MAX_AREA * UI_EPD_WIDTH * UI_EPD_HEIGHT):
+            logging.debug("EPD partial refresh, dirty box %s.", dirty)
+            if hasattr(dev, 'displayPartial_Wait'):
+                dev.displayPartial_Wait(buf)
+            else:
+                dev.displayPartial(buf)
+            _partial_refresh_count += 1
+        else:
+            if _partial_refresh_count:
+                EPD_INIT_FN(dev, EPD_FULL_UPDATE)
+            # Writing both RAM banks gives later partial refreshes a base.
+            if hasattr(dev, 'displayPartBaseImage'):
+                dev.displayPartBaseImage(buf)
+            else:
+                dev.display(buf)
+            _partial_refresh_count = 0
+        _last_frame = img.copy()
     except Exception as e:
         logging.error(f"EPD display error: {e}")
 
@@ -533,17 +982,9 @@ def display_message(msg_txt, font_to_use=font_l, fill=0):
     global ui_image_buffer, epd_instance, RASPAP_LOGO
     if not epd_instance or not ui_image_buffer:
         return
-    draw = ImageDraw.Draw(ui_image_buffer)
-    draw.rectangle((0, 0, UI_EPD_WIDTH, UI_EPD_HEIGHT), fill=255)
+    draw = ui_draw
     hdr_h = 25
-    if RASPAP_LOGO:
-        lx, ly = 5, 5
-        tw, th = get_text_dimensions(draw, "RaspAP", font_l)
-        draw.bitmap((lx, ly), RASPAP_LOGO, fill=0)
-        draw.text((lx+RASPAP_LOGO.width+5, ly+(RASPAP_LOGO.height-th)//2),
-                  "RaspAP", font=font_l, fill=0)
-    else:
-        draw.text((5, 5), "RaspAP", font=font_l, fill=0)
+    ui_image_buffer.paste(_SCREEN_TEMPLATES['message'])
     lines = msg_txt.split('\n')
     line_dims = [get_text_dimensions(draw, l, font_to_use) for l in lines]
     total_txt_h = sum(ld[1] for ld in line_dims)+(len(lines)-1)*2
@@ -560,8 +1001,8 @@ def display_final_message(message_text="RaspAP"):
     global ui_image_buffer, epd_instance, RASPAP_LOGO, font_l
     if not epd_instance or not ui_image_buffer:
         return
-    draw = ImageDraw.Draw(ui_image_buffer)
-    draw.rectangle((0, 0, UI_EPD_WIDTH, UI_EPD_HEIGHT), fill=255)
+    draw = ui_draw
+    ui_image_buffer.paste(255, (0, 0, UI_EPD_WIDTH, UI_EPD_HEIGHT))
     lines = message_text.split('\n')
     line_dims = [get_text_dimensions(draw, line, font_l) for line in lines]
     total_txt_h = sum(ld[1] for ld in line_dims)+(len(lines)-1)*5
@@ -582,100 +1023,233 @@ def display_final_message(message_text="RaspAP"):
         draw.text(((UI_EPD_WIDTH-txt_w)//2, curr_y), line, font=font_l, fill=0)
         curr_y += txt_h+5
     logging.info(f"Displaying final screen: '{message_text}'")
-    display_on_epd(epd_instance, ui_image_buffer)
+    display_on_epd(epd_instance, ui_image_buffer, full_refresh=True)
     time.sleep(5)
 
 
 def toggle_internet_feed_action():
-    global current_wlan0_connection_status
+    global g_net_toggle_pending
     update_wlan0_connection_status()
     action = "DOWN" if current_wlan0_connection_status == "NET_CONNECTED" else "UP"
-    display_message(
-        f"Net: Setting\n{HOST_CONNECTED_VIA_INTERFACE} {action}", font_to_use=font_m)
-    logging.info(f"Bringing {HOST_CONNECTED_VIA_INTERFACE} {action}...")
-    run_command(
-        f"sudo ip link set {HOST_CONNECTED_VIA_INTERFACE} {'down' if action == 'DOWN' else 'up'}")
-    if action == "UP":
-        run_command(
-            f"sudo systemctl try-restart wpa_supplicant@{HOST_CONNECTED_VIA_INTERFACE}.service || sudo systemctl try-restart wpa_supplicant.service")
-        time.sleep(10)
-    update_wlan0_connection_status()
+    g_net_toggle_pending = action
+    threading.Thread(target=_toggle_internet_feed_worker,
+                     args=(action,), daemon=True).start()
+
+
+def _toggle_internet_feed_worker(action):
+    global g_net_toggle_pending
+    try:
+        logging.info(f"Bringing {HOST_CONNECTED_VIA_INTERFACE} {action}...")
+        run_command(["sudo", "ip", "link", "set", HOST_CONNECTED_VIA_INTERFACE,
+                     'down' if action == 'DOWN' else 'up'])
+        if action == "UP":
+            rc, _ = exec_command(["sudo", "systemctl", "try-restart",
+                                  f"wpa_supplicant@{HOST_CONNECTED_VIA_INTERFACE}.service"])
+            if rc != 0:
+                run_command(["sudo", "systemctl", "try-restart",
+                             "wpa_supplicant.service"])
+            # Wait up to 10s for an address, bypassing the probe cache.
+            for _ in range(20):
+                time.sleep(0.5)
+                if get_interface_ip.__wrapped__(HOST_CONNECTED_VIA_INTERFACE):
+                    break
+        get_host_connected_ssid.cache_clear()
+        get_interface_ip.cache_clear()
+        update_wlan0_connection_status()
+    finally:
+        g_net_toggle_pending = None
 
 
 def reboot_pi(): display_message("Rebooting..."); time.sleep(
-    1); display_final_message("RaspAP\nRebooting"); run_command("sudo reboot")
+    1); display_final_message("RaspAP\nRebooting"); run_command(["sudo", "reboot"])
 
 
 def shutdown_pi(): display_message("Shutting down..."); time.sleep(
-    1); display_final_message("RaspAP\nPowered Off"); run_command("sudo shutdown now")
+    1); display_final_message("RaspAP\nPowered Off"); run_command(["sudo", "shutdown", "now"])
 
 
 def get_touch_coordinates(dev, gt_data, gt_old_data):
-    global TOUCH_INT_PIN, tp_config_module
+    global g_prev_touch_active, g_touch_press_armed
     if not dev or not gt_data or not gt_old_data or not tp_config_module:
         return None, None
     try:
-        touch_active = (tp_config_module.digital_read(TOUCH_INT_PIN) == 0) if TOUCH_INT_PIN and hasattr(
-            tp_config_module, 'digital_read') else True
-        if touch_active:
-            gt_data.Touch = 1
-        elif gt_data.Touch == 0:
+        touch_active = (tp_config_module.digital_read(
+            TOUCH_INT_PIN) == 0) if TOUCH_INT_READABLE else True
+        if touch_active and not g_prev_touch_active:
+            g_touch_press_armed = True
+        g_prev_touch_active = touch_active
+        # Idle path: INT released and no scan pending, so skip the I2C read.
+        if not touch_active and gt_data.Touch == 0:
             return None, None
+        gt_data.Touch = 1
         dev.GT_Scan(gt_data, gt_old_data)
-        if hasattr(gt_data, 'TouchCount') and gt_data.TouchCount > 0:
+        if getattr(gt_data, 'TouchCount', 0) > 0:
             ui_x = UI_EPD_WIDTH - 1 - gt_data.Y[0]
             ui_y = gt_data.X[0]
             return max(0, min(ui_x, UI_EPD_WIDTH-1)), max(0, min(ui_y, UI_EPD_HEIGHT-1))
     except Exception as e:
         logging.error(f"Touch coord error: {e}")
-        logging.debug(traceback.format_exc())
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(traceback.format_exc())
     if gt_data:
         gt_data.Touch = 0
     return None, None
 
 
-def draw_button(draw, x, y, w, h, txt, sel=False, font=font_s):
+def _on_touch_interrupt(*_args):
+    _wake_event.set()
+
+
+def enable_touch_interrupt():
+    # epdconfig exposes INT as a pull-down gpiozero Button, so a touch (INT
+    # pulled low) is its "released" edge. Returns False if not available.
+    int_button = getattr(tp_config_module, 'GPIO_INT', None)
+    if not TOUCH_INT_READABLE or not hasattr(int_button, 'when_released'):
+        return False
+    try:
+        int_button.when_released = _on_touch_interrupt
+    except Exception as e:
+        logging.warning(f"Touch INT edge detection unavailable: {e}")
+        return False
+    return True
+
+
+def wait_for_next_tick(touch_irq_enabled):
+    # Sleeps until the status poller publishes new state, or the earliest
+    # deadline: the end of a touch-ignore window, or the next 10 Hz touch poll
+    # while a touch needs polling. With INT edges an idle loop also wakes as
+    # soon as a touch starts; without them, idle polling drops to
+    # TOUCH_IDLE_POLL_INTERVAL after TOUCH_IDLE_AFTER seconds.
+    now = time.monotonic()
+    deadline = now + PERIODIC_UPDATE_INTERVAL
+    if g_ignore_touch_input_temporarily:
+        deadline = min(deadline, g_ignore_touch_until_timestamp)
+    elif touch_instance:
+        touch_pending = current_gt_dev_data is not None and current_gt_dev_data.Touch
+        if g_prev_touch_active or touch_pending:
+            deadline = min(deadline, now + TOUCH_POLL_INTERVAL)
+        elif not touch_irq_enabled:
+            idle = now - _last_activity_ts >= TOUCH_IDLE_AFTER
+            deadline = min(deadline, now + (
+                TOUCH_IDLE_POLL_INTERVAL if idle else TOUCH_POLL_INTERVAL))
+    _wake_event.wait(max(0.0, deadline - now))
+    _wake_event.clear()
+
+
+def _on_stop_signal(signum, _frame):
+    # systemd stops the service with SIGTERM; leave the loop so the finally
+    # block still puts the panel to sleep.
+    logging.info(f"Received signal {signum}, exiting...")
+    _stop_event.set()
+    _wake_event.set()
+
+
+def _render_button(w, h, txt, sel, font):
+    tile = Image.new('1', (w+1, h+1), 255)
+    draw = ImageDraw.Draw(tile)
     fill_btn, fill_txt = (0, 255) if sel else (255, 0)
-    draw.rectangle((x, y, x+w, y+h), fill=fill_btn, outline=0)
+    draw.rectangle((0, 0, w, h), fill=fill_btn, outline=0)
     if not sel:
-        draw.rectangle((x+1, y+1, x+w-1, y+h-1), outline=0, width=1)
+        draw.rectangle((1, 1, w-1, h-1), outline=0, width=1)
     txt_w, txt_h = get_text_dimensions(draw, txt, font)
-    draw.text((x+(w-txt_w)//2, y+(h-txt_h)//2), txt, font=font, fill=fill_txt)
+    draw.text(((w-txt_w)//2, (h-txt_h)//2), txt, font=font, fill=fill_txt)
+    return tile
 
 
-def check_button_press(tx, ty):
+def draw_button(draw, x, y, w, h, txt, sel=False, font=font_s):
+    key = (w, h, txt, sel, font)
+    tile = _BUTTON_CACHE.get(key)
+    if tile is None:
+        tile = _BUTTON_CACHE[key] = _render_button(w, h, txt, sel, font)
+    ui_image_buffer.paste(tile, (x, y))
+
+
+@functools.lru_cache(maxsize=64)
+def _render_vpn_row(label, active):
+    # One VPN list row; the active VPN is drawn inverted.
+    row = Image.new('1', (VPN_LIST_WIDTH+1, VPN_LIST_ITEM_HEIGHT),
+                    0 if active else 255)
+    draw = ImageDraw.Draw(row)
+    _, text_h = get_text_dimensions(draw, "A", font_s)
+    draw.text((2, (VPN_LIST_ITEM_HEIGHT - text_h)//2 - 1), label,
+              font=font_s, fill=255 if active else 0)
+    return row
+
+
+# Fixed layout, derived once from the panel size and fonts.
+_CONTENT_Y = 22 + 5  # First content line, below the header
+_CONTENT_RIGHT = UI_EPD_WIDTH - BTN_WIDTH - (BTN_MARGIN * 2)
+_scratch_draw = ImageDraw.Draw(Image.new('1', (1, 1)))
+_FOOTER_GEO_Y = UI_EPD_HEIGHT - BTN_MARGIN - get_text_dimensions(
+    _scratch_draw, "GeoIP: Placeholder", font_s)[1]
+_FOOTER_CPU_Y = _FOOTER_GEO_Y - get_text_dimensions(
+    _scratch_draw, "CPU Temp: Placeholder", font_s)[1] - 2
+
+
+def _build_screen_template(header, texts=()):
+    # Background for one screen: blank frame, header and fixed labels. Each
+    # frame pastes it, then draws the dynamic text and buttons on top
+    # (buttons last, since long lines can run under the button column).
+    tmpl = Image.new('1', (UI_EPD_WIDTH, UI_EPD_HEIGHT), 255)
+    draw = ImageDraw.Draw(tmpl)
+    _paste_header(tmpl, header)
+    for xy, txt, font in texts:
+        draw.text(xy, txt, font=font, fill=0)
+    return tmpl
+
+
+_SCREEN_TEMPLATES = {
+    'main': _build_screen_template(_HEADER_CACHE),
+    'vpn': _build_screen_template(
+        _HEADER_CACHE, [((VPN_LIST_X_START, BTN_MARGIN), "VPN Connections:", font_m)]),
+    'info': _build_screen_template(_HEADER_CACHE),
+    'system': _build_screen_template(
+        _HEADER_CACHE, [((5, _CONTENT_Y), "System Menu:", font_m)]),
+    'message': _build_screen_template(_MESSAGE_HEADER_CACHE),
+}
+
+
+def check_button_press(tx, ty, now=None):
     global show_system_menu, show_info_screen, show_vpn_menu, info_page, last_button_press
+    global g_touch_press_armed
     global available_vpns, vpn_list_scroll_offset
 
     if tx is None or ty is None:
         return ACTION_NONE
-    now = time.time()
-    if now - last_button_press < touch_cooldown:
+    if now is None:
+        now = time.monotonic()
+    if TOUCH_INT_READABLE:
+        # One press per physical touch: ignore reports until the next edge.
+        if not g_touch_press_armed:
+            return ACTION_NONE
+        g_touch_press_armed = False
+        cooldown = touch_cooldown
+    else:
+        cooldown = touch_cooldown_no_int
+    if now - last_button_press < cooldown:
         return ACTION_NONE
 
     pressed_action_name = None
     action_caused_menu_change = False
 
     if show_vpn_menu:
-        for name, (x, y, w, h) in VPN_LIST_NAV_BUTTON_AREAS.items():
-            if x <= tx <= x+w and y <= ty <= y+h:
-                if name == 'up':
-                    if vpn_list_scroll_offset > 0:
-                        vpn_list_scroll_offset -= 1
-                        pressed_action_name = "VPN_SCROLL_UP"
-                elif name == 'down':
-                    if vpn_list_scroll_offset < len(available_vpns) - VPN_LIST_ITEMS_PER_SCREEN:
-                        vpn_list_scroll_offset += 1
-                        pressed_action_name = "VPN_SCROLL_DOWN"
-                elif name == 'disconnect':
-                    if current_vpn_status == "VPN_ON":
-                        disconnect_vpn()
-                        pressed_action_name = "VPN_DISCONNECT"
-                elif name == 'back':
-                    show_vpn_menu = False
-                    action_caused_menu_change = True
-                    pressed_action_name = "VPN_BACK"
-                break
+        name = _button_at(VPN_NAV_BUTTONS_BY_SLOT, tx, ty)
+        if name == 'up':
+            if vpn_list_scroll_offset > 0:
+                vpn_list_scroll_offset -= 1
+                pressed_action_name = "VPN_SCROLL_UP"
+        elif name == 'down':
+            if vpn_list_scroll_offset < len(available_vpns) - VPN_LIST_ITEMS_PER_SCREEN:
+                vpn_list_scroll_offset += 1
+                pressed_action_name = "VPN_SCROLL_DOWN"
+        elif name == 'disconnect':
+            if current_vpn_status == "VPN_ON":
+                disconnect_vpn()
+                pressed_action_name = "VPN_DISCONNECT"
+        elif name == 'back':
+            show_vpn_menu = False
+            action_caused_menu_change = True
+            pressed_action_name = "VPN_BACK"
 
         if not pressed_action_name:
             list_y_current = VPN_LIST_Y_START
@@ -689,50 +1263,50 @@ def check_button_press(tx, ty):
                 list_y_current += VPN_LIST_ITEM_HEIGHT + 2
 
     elif show_info_screen:
-        for name, (x, y, w, h) in INFO_BUTTON_AREAS.items():
-            if x <= tx <= x+w and y <= ty <= y+h:
-                pressed_action_name = f"INFO_{name.upper()}"
-                if name == 'prev':
-                    info_page = max(0, info_page - 1)
-                elif name == 'next':
-                    info_page = min(MAX_INFO_PAGES - 1, info_page + 1)
-                elif name == 'back':
-                    show_info_screen = False
-                    action_caused_menu_change = True
-                break
+        name = _button_at(INFO_BUTTONS_BY_SLOT, tx, ty)
+        if name:
+            pressed_action_name = f"INFO_{name.upper()}"
+            if name == 'prev':
+                info_page = max(0, info_page - 1)
+            elif name == 'next':
+                info_page = min(MAX_INFO_PAGES - 1, info_page + 1)
+            elif name == 'back':
+                show_info_screen = False
+                action_caused_menu_change = True
     elif show_system_menu:
-        for name, (x, y, w, h) in SYSTEM_BUTTON_AREAS.items():
-            if x <= tx <= x+w and y <= ty <= y+h:
-                pressed_action_name = f"SYS_{name.upper()}"
-                if name == 'reboot':
-                    reboot_pi()
-                elif name == 'shutdown':
-                    shutdown_pi()
-                elif name == 'back':
-                    show_system_menu = False
-                    action_caused_menu_change = True
-                break
+        name = _button_at(SYSTEM_BUTTONS_BY_SLOT, tx, ty)
+        if name:
+            pressed_action_name = f"SYS_{name.upper()}"
+            if name == 'reboot':
+                reboot_pi()
+            elif name == 'shutdown':
+                shutdown_pi()
+            elif name == 'back':
+                show_system_menu = False
+                action_caused_menu_change = True
     else:
-        for name, (x, y, w, h) in BUTTON_AREAS.items():
-            if x <= tx <= x+w and y <= ty <= y+h:
-                pressed_action_name = f"MAIN_{name.upper()}"
-                if name == 'net_toggle':
-                    toggle_internet_feed_action()
-                elif name == 'vpn_menu':
-                    show_vpn_menu = True
-                    vpn_list_scroll_offset = 0
-                    action_caused_menu_change = True
-                elif name == 'system':
-                    show_system_menu = True
-                    action_caused_menu_change = True
-                elif name == 'info':
-                    show_info_screen = True
-                    info_page = 0
-                    action_caused_menu_change = True
-                break
+        name = _button_at(MAIN_BUTTONS_BY_SLOT, tx, ty)
+        if name == 'net_toggle' and g_net_toggle_pending:
+            logging.debug("Net toggle in progress. Press ignored.")
+        elif name:
+            pressed_action_name = f"MAIN_{name.upper()}"
+            if name == 'net_toggle':
+                toggle_internet_feed_action()
+            elif name == 'vpn_menu':
+                load_vpn_connections()
+                show_vpn_menu = True
+                vpn_list_scroll_offset = 0
+                action_caused_menu_change = True
+            elif name == 'system':
+                show_system_menu = True
+                action_caused_menu_change = True
+            elif name == 'info':
+                show_info_screen = True
+                info_page = 0
+                action_caused_menu_change = True
 
     if pressed_action_name:
-        logging.info(f"Button action: {pressed_action_name} @({tx},{ty}).")
+        logging.info("Button action: %s @(%s,%s).", pressed_action_name, tx, ty)
         last_button_press = now
         if action_caused_menu_change:
             return ACTION_MENU_CHANGE
@@ -745,30 +1319,8 @@ def draw_main_ui_elements(draw):
     global show_system_menu, show_info_screen, show_vpn_menu, info_page, RASPAP_LOGO, available_vpns
     global vpn_list_scroll_offset
 
-    draw.rectangle((0, 0, UI_EPD_WIDTH, UI_EPD_HEIGHT), fill=255)
-    update_system_stats()
-    info_w = UI_EPD_WIDTH-BTN_WIDTH-(BTN_MARGIN*2)
-    hdr_h = 22
-    y_offset = hdr_h+5
-
-    if RASPAP_LOGO:
-        lx, ly = 5, (hdr_h-RASPAP_LOGO.height)//2
-        ly = max(2, ly)
-        draw.bitmap((lx, ly), RASPAP_LOGO, fill=0)
-        htx = lx+RASPAP_LOGO.width+5
-    else:
-        htx = 5
-    thw, thh = get_text_dimensions(draw, "RaspAP", font_l)
-    hty = (hdr_h-thh)//2
-    hty = max(2, hty)
-    draw.text((htx, hty), "RaspAP", font=font_l, fill=0)
-    draw.line((5, hdr_h, UI_EPD_WIDTH - BTN_WIDTH -
-              (BTN_MARGIN*2) - BTN_MARGIN, hdr_h), fill=0)
-
     if show_vpn_menu:
-        draw.text((VPN_LIST_X_START, BTN_MARGIN),
-                  "VPN Connections:", font=font_m, fill=0)
-
+        ui_image_buffer.paste(_SCREEN_TEMPLATES['vpn'])
         list_y_current = VPN_LIST_Y_START
         if not available_vpns:
             draw.text((VPN_LIST_X_START, list_y_current),
@@ -776,21 +1328,10 @@ def draw_main_ui_elements(draw):
         else:
             for i in range(vpn_list_scroll_offset, min(len(available_vpns), vpn_list_scroll_offset + VPN_LIST_ITEMS_PER_SCREEN)):
                 vpn_def = available_vpns[i]
-                vpn_name_to_display = vpn_def['name']
                 is_active = current_vpn_config_basename == vpn_def[
                     'config_basename_no_ext'] and current_vpn_status == "VPN_ON"
-
-                _, text_height_s = get_text_dimensions(draw, "A", font_s)
-
-                if is_active:
-                    draw.rectangle((VPN_LIST_X_START, list_y_current,
-                                    VPN_LIST_X_START + VPN_LIST_WIDTH, list_y_current + VPN_LIST_ITEM_HEIGHT-1),
-                                   fill=0, outline=0)
-                    draw.text((VPN_LIST_X_START + 2, list_y_current + (VPN_LIST_ITEM_HEIGHT - text_height_s)//2 - 1),
-                              vpn_name_to_display[:20], font=font_s, fill=255)
-                else:
-                    draw.text((VPN_LIST_X_START + 2, list_y_current + (VPN_LIST_ITEM_HEIGHT - text_height_s)//2 - 1),
-                              vpn_name_to_display[:20], font=font_s, fill=0)
+                ui_image_buffer.paste(_render_vpn_row(vpn_def['_label'], is_active),
+                                      (VPN_LIST_X_START, list_y_current))
                 list_y_current += VPN_LIST_ITEM_HEIGHT + 2
 
         draw_button(draw, *VPN_LIST_NAV_BUTTON_AREAS['up'], "UP", sel=(
@@ -806,42 +1347,39 @@ def draw_main_ui_elements(draw):
         draw_button(draw, *VPN_LIST_NAV_BUTTON_AREAS['back'], "BACK")
 
     elif show_info_screen:
-        y_info = y_offset
+        ui_image_buffer.paste(_SCREEN_TEMPLATES['info'])
+        y_info = _CONTENT_Y
         if info_page == 0:
             draw.text(
                 (5, y_info), f"Host Connection ({HOST_CONNECTED_VIA_INTERFACE}):", font=font_m, fill=0)
             y_info += 18
-            host_ssid = get_host_connected_ssid()
+            host_ssid = current_host_ssid
             draw.text(
                 (5, y_info), f"  Network: {host_ssid if host_ssid else 'Not Connected'}", font=font_s, fill=0)
             y_info += 15
-            host_ip = get_interface_ip(HOST_CONNECTED_VIA_INTERFACE)
+            host_ip = current_host_ip
             draw.text(
                 (5, y_info), f"  IP: {host_ip if host_ip else 'N/A'}", font=font_s, fill=0)
             y_info += 15
             y_info += 5
-            update_ap_hotspot_status()
             draw.text(
                 (5, y_info), f"AP Hotspot ({AP_BROADCAST_INTERFACE}):", font=font_m, fill=0)
             y_info += 18
             if current_ap_hotspot_status == "AP_ON":
-                ap_ssid = get_cached_ap_ssid()
-                clients = get_cached_ap_clients()
                 draw.text(
-                    (5, y_info), f"  Status: ON SSID: {ap_ssid[:10]} Clients: {clients}", font=font_s, fill=0)
+                    (5, y_info), f"  Status: ON SSID: {current_ap_ssid[:10]} Clients: {current_ap_clients}", font=font_s, fill=0)
             else:
                 draw.text((5, y_info), "  Status: OFF", font=font_s, fill=0)
         elif info_page == 1:
             draw.text(
-                (5, y_info), f"CPU: {system_stats_cache['cpu_usage']:.1f}% Temp: {system_stats_cache['cpu_temp']:.1f}°C", font=font_s, fill=0)
+                (5, y_info), f"CPU: {system_stats_cache['cpu_usage_s']}% Temp: {system_stats_cache['cpu_temp_s']}°C", font=font_s, fill=0)
             y_info += 15
             geo = system_stats_cache['geo_location']
             draw.text((5, y_info), f"GeoIP: {geo[:22]}", font=font_s, fill=0)
 
-        pg_txt_x_base = UI_EPD_WIDTH - BTN_WIDTH - (BTN_MARGIN * 2)
         pg_txt = f"Page {info_page+1}/{MAX_INFO_PAGES}"
         ptw, _ = get_text_dimensions(draw, pg_txt, font_t)
-        draw.text((pg_txt_x_base - ptw - BTN_MARGIN,
+        draw.text((_CONTENT_RIGHT - ptw - BTN_MARGIN,
                   UI_EPD_HEIGHT-12), pg_txt, font=font_t, fill=0)
 
         draw_button(
@@ -851,22 +1389,23 @@ def draw_main_ui_elements(draw):
         draw_button(draw, *INFO_BUTTON_AREAS['back'], "BACK")
 
     elif show_system_menu:
-        draw.text((5, y_offset), "System Menu:", font=font_m, fill=0)
+        ui_image_buffer.paste(_SCREEN_TEMPLATES['system'])
         draw_button(draw, *SYSTEM_BUTTON_AREAS['reboot'], "REBOOT")
         draw_button(draw, *SYSTEM_BUTTON_AREAS['shutdown'], "SHUTDOWN")
         draw_button(draw, *SYSTEM_BUTTON_AREAS['back'], "BACK")
 
     else:  # Main screen
-        update_wlan0_connection_status()
-        update_ap_hotspot_status()
-        update_vpn_status()
-        y_main = y_offset
+        ui_image_buffer.paste(_SCREEN_TEMPLATES['main'])
+        y_main = _CONTENT_Y
         line_spacing = 17
 
         wlan0_is_fully_connected = (
             current_wlan0_connection_status == "NET_CONNECTED")
-        host_ssid_main = get_host_connected_ssid()
-        if wlan0_is_fully_connected:
+        host_ssid_main = current_host_ssid
+        if g_net_toggle_pending:
+            draw.text(
+                (5, y_main), f"Net: Setting {g_net_toggle_pending}...", font=font_m, fill=0)
+        elif wlan0_is_fully_connected:
             draw.text(
                 (5, y_main), f"Net: {(host_ssid_main[:20] if host_ssid_main else 'Connecting...')}", font=font_m, fill=0)
         elif current_wlan0_connection_status == "NET_ASSOCIATED_NO_IP":
@@ -888,19 +1427,12 @@ def draw_main_ui_elements(draw):
         y_main += line_spacing
 
         if current_ap_hotspot_status == "AP_ON":
-            clients = get_cached_ap_clients()
-            draw.text((5, y_main), f"Clients: {clients}", font=font_m, fill=0)
+            draw.text(
+                (5, y_main), f"Clients: {current_ap_clients}", font=font_m, fill=0)
         else:
             draw.text((5, y_main), "Hotspot Off", font=font_m, fill=0)
 
-        _, geo_h = get_text_dimensions(draw, "GeoIP: Placeholder", font_s)
-        geoip_y = UI_EPD_HEIGHT - BTN_MARGIN - geo_h
-        geo = system_stats_cache['geo_location']
-        draw.text((5, geoip_y), f"GeoIP: {geo[:20]}", font=font_s, fill=0)
-        _, cpu_h = get_text_dimensions(draw, "CPU Temp: Placeholder", font_s)
-        cpu_temp_y = geoip_y - cpu_h - 2
-        draw.text((5, cpu_temp_y),
-                  f"CPU Temp: {system_stats_cache['cpu_temp']:.1f}°C", font=font_s, fill=0)
+        draw_stats_footer(draw)
 
         draw_button(draw, *BUTTON_AREAS['net_toggle'],
                     "NET ON" if wlan0_is_fully_connected else "NET OFF", sel=not wlan0_is_fully_connected)
@@ -911,80 +1443,145 @@ def draw_main_ui_elements(draw):
     display_on_epd(epd_instance, ui_image_buffer)
 
 
+def draw_stats_footer(draw):
+    # CPU temp and GeoIP lines at the bottom of the main screen.
+    geo = system_stats_cache['geo_location']
+    draw.text((5, _FOOTER_GEO_Y), f"GeoIP: {geo[:20]}", font=font_s, fill=0)
+    draw.text((5, _FOOTER_CPU_Y),
+              f"CPU Temp: {system_stats_cache['cpu_temp_s']}°C", font=font_s, fill=0)
+
+
+def draw_temp_region(draw):
+    # Redraws only the main-screen footer when just the CPU temp changed;
+    # display_on_epd then ships it as a small partial refresh.
+    ui_image_buffer.paste(
+        255, (0, _FOOTER_CPU_Y, _CONTENT_RIGHT+1, UI_EPD_HEIGHT))
+    draw_stats_footer(draw)
+    display_on_epd(epd_instance, ui_image_buffer)
+
+
+def _status_worker():
+    # Refreshes system stats and the network/AP/VPN status off the UI thread,
+    # then wakes the main loop to compare and redraw.
+    while not _stop_event.wait(PERIODIC_UPDATE_INTERVAL):
+        try:
+            update_system_stats()
+            poll_state()
+        except Exception as e:
+            logging.error(f"Status update error: {e}")
+        _wake_event.set()
+
+
+def start_status_poller():
+    threading.Thread(target=_status_worker, name="status", daemon=True).start()
+
+
+def poll_state():
+    # Runs the status updaters; drawing and change detection only read the
+    # resulting globals. Called from the status poller thread every
+    # PERIODIC_UPDATE_INTERVAL (and once at startup).
+    # The subprocess/API probes behind the updaters are independent, so warm
+    # their TTL caches concurrently; the updaters below then read the cached
+    # results and a poll costs the slowest probe rather than their sum.
+    probes = [(get_host_connected_ssid, HOST_CONNECTED_VIA_INTERFACE),
+              (get_ap_hotspot_status_via_api,)]
+    if current_vpn_config_basename:
+        probes.append((get_specific_vpn_service_status,
+                       get_vpn_service_name(current_vpn_config_basename)))
+    for fut in [_probe_executor.submit(*probe) for probe in probes]:
+        fut.exception()
+    if get_ap_hotspot_status_via_api():
+        # Served from the API snapshot the hotspot probe just refreshed.
+        get_cached_ap_ssid()
+        get_cached_ap_clients()
+    update_wlan0_connection_status()
+    update_ap_hotspot_status()
+    update_vpn_status()
+
+
+# Every key get_current_display_state can set, except cpu_temp; the order
+# defines the positions in a state's '_sig' tuple.
+_STATE_KEYS = ('show_info', 'info_pg', 'show_system', 'show_vpn', 'vpn_scroll',
+               'wlan0_conn', 'host_ssid', 'net_pending', 'ap_hotspot_stat',
+               'vpn_stat', 'vpn_name', 'ap_bssid_w1', 'ap_clients_w1',
+               'geo_loc', 'wlan0_ip', 'cpu_use', 'geo_loc_info_pg')
+
+
 def get_current_display_state():
+    # Only reads globals, under the status lock, so a concurrent publish
+    # cannot hand us a half-updated mix of old and new values.
+    with _status_lock:
+        return _build_display_state()
+
+
+def _build_display_state():
     state = {
         'show_info': show_info_screen, 'info_pg': info_page if show_info_screen else -1,
         'show_system': show_system_menu,
         'show_vpn': show_vpn_menu, 'vpn_scroll': vpn_list_scroll_offset if show_vpn_menu else -1,
-        'wlan0_conn': current_wlan0_connection_status, 'host_ssid': get_host_connected_ssid(),
+        'wlan0_conn': current_wlan0_connection_status, 'host_ssid': current_host_ssid,
+        'net_pending': g_net_toggle_pending,
         'ap_hotspot_stat': current_ap_hotspot_status,
         'vpn_stat': current_vpn_status, 'vpn_name': current_vpn_display_name,
     }
     if current_ap_hotspot_status == "AP_ON":
-        state['ap_bssid_w1'] = get_cached_ap_ssid()
-        state['ap_clients_w1'] = get_cached_ap_clients()
+        state['ap_bssid_w1'] = current_ap_ssid
+        state['ap_clients_w1'] = current_ap_clients
 
+    cpu_temp = None
     if not any([show_system_menu, show_info_screen, show_vpn_menu]):
-        state['cpu_temp'] = f"{system_stats_cache.get('cpu_temp', 0):.1f}"
+        cpu_temp = system_stats_cache.get('cpu_temp', 0)
         state['geo_loc'] = system_stats_cache.get('geo_location', 'Unknown')
     elif show_info_screen and info_page == 0:
-        state['wlan0_ip'] = get_interface_ip(HOST_CONNECTED_VIA_INTERFACE)
+        state['wlan0_ip'] = current_host_ip
     elif show_info_screen and info_page == 1:
-        state['cpu_use'] = f"{system_stats_cache.get('cpu_usage', 0):.1f}"
+        state['cpu_use'] = system_stats_cache['cpu_usage_s']
         state['geo_loc_info_pg'] = system_stats_cache.get(
             'geo_location', 'Unknown')
+
+    # Signature of everything except cpu_temp, which has its own threshold
+    state['_sig'] = tuple(map(state.get, _STATE_KEYS))
+    if cpu_temp is not None:
+        state['cpu_temp'] = system_stats_cache['cpu_temp_s']
+        state['cpu_temp_f'] = float(cpu_temp)
     return state
 
 
 def have_states_changed(old, new):
     if not old:
         return True
-
-    # Make copies to avoid modifying the original dicts during pop
-    old_cp = old.copy()
-    new_cp = new.copy()
-
-    # Extract CPU temperature strings for separate comparison
-    # The key 'cpu_temp' is used on the main screen in your get_current_display_state
-    old_t_str = old_cp.pop('cpu_temp', None)
-    new_t_str = new_cp.pop('cpu_temp', None)
-
-    # Compare the rest of the dictionaries (excluding cpu_temp)
-    if old_cp != new_cp:
-        changed_items = {k: (old_cp.get(k), new_cp.get(k)) for k in set(
-            old_cp) | set(new_cp) if old_cp.get(k) != new_cp.get(k)}
-        logging.debug(f"State change (non-temp items): {changed_items}")
+    same_sig = old['_sig'] == new['_sig']
+    old_t, new_t = old.get('cpu_temp_f'), new.get('cpu_temp_f')
+    # Common idle tick: same signature and the very same temperature reading.
+    if same_sig and old_t == new_t:
+        return False
+
+    if not same_sig:
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            changed_items = {k: (ov, nv) for k, ov, nv in zip(
+                _STATE_KEYS, old['_sig'], new['_sig']) if ov != nv}
+            logging.debug("State change (non-temp items): %s", changed_items)
         return True
 
-    # Now, compare CPU temperatures if both exist
-    if old_t_str is not None and new_t_str is not None:
-        try:
-            # ---- THIS IS THE LINE TO CHANGE THE TEMP DELTA ----
-            temp_delta_threshold = 2.0  # Example: Refresh if temp changes by more than 2.0 degrees
-            # ---- CHANGE THE VALUE ABOVE ----
-            if abs(float(new_t_str) - float(old_t_str)) > temp_delta_threshold:
-                logging.debug(
-                    f"CPU Temp redraw trigger ({temp_delta_threshold}°C delta): {old_t_str}°C -> {new_t_str}°C")
-                return True
-        # Handle case where temp might not be float parsable (e.g. "N/A")
-        except ValueError:
-            # If string representation changed (e.g. from number to "N/A")
-            if old_t_str != new_t_str:
-                logging.debug(
-                    f"CPU Temp string representation changed: {old_t_str} -> {new_t_str}")
-                return True
-    elif old_t_str != new_t_str:  # If one temp value exists and the other doesn't
-        logging.debug(f"CPU Temp presence changed: {old_t_str} -> {new_t_str}")
+    if old_t is not None and new_t is not None:
+        if abs(new_t - old_t) > CPU_TEMP_REDRAW_DELTA:
+            logging.debug("CPU Temp redraw trigger (%s°C delta): %s°C -> %s°C",
+                          CPU_TEMP_REDRAW_DELTA, old['cpu_temp'], new['cpu_temp'])
+            return True
+    elif old_t != new_t:  # If one temp value exists and the other doesn't
+        logging.debug("CPU Temp presence changed: %s -> %s",
+                      old.get('cpu_temp'), new.get('cpu_temp'))
         return True
 
     return False
 
 
 def main():
-    global epd_instance, touch_instance, ui_image_buffer, current_gt_dev_data, old_gt_dev_data, tp_config_module, last_displayed_state
-    global g_ignore_touch_input_temporarily, g_ignore_touch_until_timestamp
+    global epd_instance, touch_instance, ui_image_buffer, ui_draw, current_gt_dev_data, old_gt_dev_data, tp_config_module, last_displayed_state
+    global g_ignore_touch_input_temporarily, g_ignore_touch_until_timestamp, _last_activity_ts
 
     current_state = None
+    signal.signal(signal.SIGTERM, _on_stop_signal)
     try:
         if EPD_DRIVER_CLASS is None:
             logging.critical("EPD_DRIVER_CLASS not defined.")
@@ -992,46 +1589,25 @@ def main():
         epd_instance = EPD_DRIVER_CLASS()
         logging.info(f"EPD instance created: {EPD_DRIVER_CLASS.__name__}")
 
-        init_success = False
-        if hasattr(epd_instance, 'init') and callable(getattr(epd_instance, 'init')):
-            try:
-                if hasattr(EPD_DRIVER_CLASS, 'FULL_UPDATE'):
-                    logging.info(
-                        "EPD init: Using EPD_DRIVER_CLASS.FULL_UPDATE.")
-                    if epd_instance.init(EPD_DRIVER_CLASS.FULL_UPDATE) == -1:
-                        logging.critical(
-                            "EPD init() failed (driver internal).")
-                        sys.exit(1)
-                else:
-                    logging.warning(
-                        "EPD_DRIVER_CLASS.FULL_UPDATE not found. Trying init(0).")
-                    if epd_instance.init(0) == -1:
-                        logging.critical("EPD init(0) failed.")
-                        sys.exit(1)
-                init_success = True
-                logging.info("EPD init() called.")
-            except Exception as e_init:
-                logging.critical(
-                    f"EPD init() error: {e_init}\n{traceback.format_exc()}")
+        try:
+            logging.info(f"EPD init: mode {EPD_FULL_UPDATE}.")
+            if EPD_INIT_FN(epd_instance, EPD_FULL_UPDATE) == -1:
+                logging.critical("EPD init() failed (driver internal).")
                 sys.exit(1)
-        else:
-            logging.critical("EPD instance has no callable init() method.")
+            logging.info("EPD init() called.")
+        except Exception as e_init:
+            logging.critical(
+                f"EPD init() error: {e_init}\n{traceback.format_exc()}")
             sys.exit(1)
 
-        if not init_success:
-            logging.critical("EPD init not successful.")
-            sys.exit(1)
-
-        if hasattr(epd_instance, 'Clear') and callable(getattr(epd_instance, 'Clear')):
-            epd_instance.Clear(0xFF)
-            logging.info("EPD Clear(0xFF) called.")
-        elif hasattr(epd_instance, 'clear') and callable(getattr(epd_instance, 'clear')):
-            epd_instance.clear(0xFF)
-            logging.info("EPD clear(0xFF) called.")
+        if EPD_CLEAR_FN:
+            EPD_CLEAR_FN(epd_instance, 0xFF)
+            logging.info(f"EPD {EPD_CLEAR_FN.__name__}(0xFF) called.")
         else:
             logging.warning("EPD has no Clear/clear method.")
 
         ui_image_buffer = Image.new('1', (UI_EPD_WIDTH, UI_EPD_HEIGHT), 255)
+        ui_draw = ImageDraw.Draw(ui_image_buffer)
 
         if TOUCH_DRIVER_CLASS and GT_Development_Class:
             try:
@@ -1050,6 +1626,14 @@ def main():
             logging.warning(
                 "Touch driver/GT_Development_Class missing. Touch disabled.")
 
+        touch_irq_enabled = bool(touch_instance) and enable_touch_interrupt()
+        # The touch objects never change after init; bind them once for the loop.
+        scan_touch = functools.partial(
+            get_touch_coordinates, touch_instance, current_gt_dev_data,
+            old_gt_dev_data) if touch_instance else None
+        logging.info(
+            f"Touch wake-up: {'INT edge' if touch_irq_enabled else 'polling'}.")
+
         load_vpn_connections()
         update_vpn_status(initial_check=True)
 
@@ -1058,34 +1642,37 @@ def main():
 
         logging.info("Performing initial UI draw...")
         update_system_stats(force_geoip_update=True)
-        update_wlan0_connection_status()
-        update_ap_hotspot_status()
+        poll_state()
+        start_status_poller()
 
         current_state = get_current_display_state()
-        draw_main_ui_elements(ImageDraw.Draw(ui_image_buffer))
+        draw_main_ui_elements(ui_draw)
         last_displayed_state = current_state
 
+        # Loop-invariant callables bound to locals for the per-tick path.
+        monotonic = time.monotonic
+        stop_requested = _stop_event.is_set
+        check_press = check_button_press
+        get_state = get_current_display_state
+        states_changed = have_states_changed
+        wait_tick = wait_for_next_tick
+
         logging.info("Starting main loop...")
-        loop_counter = 0
-        while True:
+        while not stop_requested():
             tx, ty = None, None
             redraw = False
-            now_loop = time.time()
-            loop_counter += 1
+            now_loop = monotonic()
 
-            if g_ignore_touch_input_temporarily and now_loop < g_ignore_touch_until_timestamp:
-                pass
-            elif g_ignore_touch_input_temporarily:
+            if g_ignore_touch_input_temporarily and now_loop >= g_ignore_touch_until_timestamp:
                 g_ignore_touch_input_temporarily = False
                 logging.debug("Touch ignore period ended.")
 
-            if not g_ignore_touch_input_temporarily and touch_instance:
-                tx, ty = get_touch_coordinates(
-                    touch_instance, current_gt_dev_data, old_gt_dev_data)
+            if not g_ignore_touch_input_temporarily and scan_touch:
+                tx, ty = scan_touch()
 
             action_result = ACTION_NONE
             if tx is not None:
-                action_result = check_button_press(tx, ty)
+                action_result = check_press(tx, ty, now_loop)
 
             if action_result == ACTION_NORMAL_PRESS:
                 redraw = True
@@ -1093,31 +1680,30 @@ def main():
             elif action_result == ACTION_MENU_CHANGE:
                 redraw = True
                 g_ignore_touch_input_temporarily = True
-                g_ignore_touch_until_timestamp = time.time() + 0.7
-                logging.info(
-                    f"Menu change. Ignoring touch until {g_ignore_touch_until_timestamp:.2f}")
+                g_ignore_touch_until_timestamp = now_loop + 0.7
+                logging.info("Menu change. Ignoring touch until %.2f",
+                             g_ignore_touch_until_timestamp)
                 if current_gt_dev_data:
                     current_gt_dev_data.Touch = 0
                     current_gt_dev_data.TouchCount = 0
 
-            if loop_counter % 10 == 0:
-                update_system_stats()
-                update_wlan0_connection_status()
-                update_ap_hotspot_status()
-                update_vpn_status()
-
-            current_state_candidate = get_current_display_state()
-            if not redraw and have_states_changed(last_displayed_state, current_state_candidate):
+            current_state = get_state()
+            if not redraw and states_changed(last_displayed_state, current_state):
                 logging.info(
                     "State change (periodic/no touch) triggered redraw.")
                 redraw = True
 
             if redraw:
-                current_state = get_current_display_state()
-                draw_main_ui_elements(ImageDraw.Draw(ui_image_buffer))
+                if (last_displayed_state and 'cpu_temp' in current_state
+                        and last_displayed_state['_sig'] == current_state['_sig']):
+                    draw_temp_region(ui_draw)
+                else:
+                    draw_main_ui_elements(ui_draw)
                 last_displayed_state = current_state
+            if redraw or tx is not None:
+                _last_activity_ts = now_loop
 
-            time.sleep(0.1)
+            wait_tick(touch_irq_enabled)
 
     except IOError as e:
         logging.error(f"IOError in main: {e}\n{traceback.format_exc()}")
@@ -1128,10 +1714,10 @@ def main():
             f"UNEXPECTED ERROR IN MAIN: {e}\n{traceback.format_exc()}")
     finally:
         logging.info("Cleaning up...")
-        if epd_instance and hasattr(epd_instance, 'sleep') and callable(getattr(epd_instance, 'sleep')):
+        if epd_instance and EPD_SLEEP_FN:
             try:
                 logging.info("Putting EPD to sleep.")
-                epd_instance.sleep()
+                EPD_SLEEP_FN(epd_instance)
             except Exception as e:
                 logging.error(f"EPD sleep error: {e}")
 
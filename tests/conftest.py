@@ -0,0 +1,32 @@
+import os
+import sys
+import types
+
+# raspap_display imports the panel drivers, and TP_lib.epdconfig opens SPI,
+# I2C and GPIO devices at import time. Stand-ins for the three hardware
+# libraries let the tests run off the Pi (and never touch a real panel).
+
+
+class _Device:
+    value = 0  # Inputs read low, so the panel never reports busy
+
+    def __init__(self, *args, **kwargs):
+        self.when_released = None
+
+    def __getattr__(self, name):
+        # on(), off(), close(), writebytes(), write_byte_data(), ...
+        return lambda *args, **kwargs: 0
+
+
+def _stub_module(name, **attrs):
+    module = types.ModuleType(name)
+    module.__dict__.update(attrs)
+    sys.modules[name] = module
+
+
+_stub_module("spidev", SpiDev=_Device)
+_stub_module("smbus", SMBus=_Device)
+_stub_module("gpiozero", LED=_Device, Button=_Device,
+             DigitalOutputDevice=_Device, DigitalInputDevice=_Device)
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
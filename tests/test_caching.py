@@ -0,0 +1,96 @@
+from concurrent.futures import Future
+
+import requests
+
+import raspap_display
+
+
+def test_ttl_cache_expires_per_argument_tuple():
+    calls = []
+
+    @raspap_display.ttl_cache(5)
+    def probe(arg):
+        calls.append(arg)
+        return len(calls)
+
+    assert probe('a', now=0) == 1
+    assert probe('a', now=4.9) == 1
+    assert probe('b', now=4.9) == 2
+    assert probe('a', now=5) == 3
+    probe.cache_clear()
+    assert probe('a', now=5) == 4
+    assert calls == ['a', 'b', 'a', 'a']
+
+
+class _FakeResponse:
+    status_code = 200
+
+    def __init__(self, content):
+        self.content = content
+
+    def raise_for_status(self):
+        pass
+
+
+class _FlakySession:
+    def __init__(self):
+        self.fail = False
+
+    def get(self, url, params=None, timeout=None):
+        if self.fail:
+            raise requests.ConnectionError("API down")
+        return _FakeResponse(b'{"hostapdStatus": 1}')
+
+
+def test_api_get_falls_back_to_last_good_response(monkeypatch):
+    session = _FlakySession()
+    monkeypatch.setattr(raspap_display, 'RASPAP_API_KEY', 'key')
+    monkeypatch.setattr(raspap_display, '_api_session', session)
+    monkeypatch.setattr(raspap_display, '_api_last_good', {})
+
+    assert raspap_display.call_raspap_api('system') == {'hostapdStatus': 1}
+    session.fail = True
+    assert raspap_display.call_raspap_api('system') == {'hostapdStatus': 1}
+
+    # Once the last good response is older than API_STALE_MAX, give up.
+    for key, (ts, result) in list(raspap_display._api_last_good.items()):
+        raspap_display._api_last_good[key] = (
+            ts - raspap_display.API_STALE_MAX - 1, result)
+    assert raspap_display.call_raspap_api('system') is None
+
+
+class _InstantExecutor:
+    def __init__(self, results):
+        self.results = results
+
+    def submit(self, fn):
+        fut = Future()
+        fut.set_result(self.results.pop(0))
+        return fut
+
+
+def test_geoip_retry_backoff_doubles_and_clamps(monkeypatch):
+    cache = raspap_display.system_stats_cache
+    for key, value in (('geo_future', None), ('geo_force', False),
+                       ('next_geo_update', 0), ('geo_retry_delay', 0),
+                       ('geo_location', 'Unknown'), ('last_geo_update', 0)):
+        monkeypatch.setitem(cache, key, value)
+    monkeypatch.setattr(raspap_display, '_geo_executor',
+                        _InstantExecutor([None] * 7 + ["Town, Land"]))
+
+    now, delays = 0, []
+    raspap_display.update_geoip_location(now, force=True)
+    for _ in range(7):
+        now += 1
+        raspap_display.update_geoip_location(now)  # harvest the failure
+        delays.append(cache['geo_retry_delay'])
+        assert cache['next_geo_update'] == now + delays[-1]
+        now = cache['next_geo_update']
+        raspap_display.update_geoip_location(now)  # retry is due
+    assert delays == [60, 120, 240, 480, 960, 1800, 1800]
+    assert cache['geo_location'] == 'Unknown'
+
+    raspap_display.update_geoip_location(now + 1)
+    assert cache['geo_location'] == "Town, Land"
+    assert cache['geo_retry_delay'] == 0
+    assert cache['next_geo_update'] == now + 1 + raspap_display.GEOIP_REFRESH_INTERVAL
@@ -0,0 +1,58 @@
+from PIL import Image
+
+import raspap_display
+
+
+class _FakeEPD:
+    def __init__(self):
+        self.calls = []
+
+    def getbuffer(self, img):
+        return img.tobytes()
+
+    def displayPartial(self, buf):
+        self.calls.append('partial')
+
+    def displayPartBaseImage(self, buf):
+        self.calls.append('full')
+
+
+def _frame(dot=None, fill_rows=0):
+    img = Image.new('1', (raspap_display.UI_EPD_WIDTH,
+                          raspap_display.UI_EPD_HEIGHT), 255)
+    if dot is not None:
+        img.putpixel((dot, 0), 0)
+    if fill_rows:
+        img.paste(0, (0, 0, raspap_display.UI_EPD_WIDTH, fill_rows))
+    return img
+
+
+def test_partial_refreshes_until_a_full_one_is_due(monkeypatch):
+    inits = []
+    monkeypatch.setattr(raspap_display, '_last_frame', None)
+    monkeypatch.setattr(raspap_display, '_partial_refresh_count', 0)
+    monkeypatch.setattr(raspap_display, 'EPD_INIT_FN',
+                        lambda dev, mode: inits.append(mode))
+    epd = _FakeEPD()
+    limit = raspap_display.PARTIAL_REFRESHES_BEFORE_FULL
+
+    raspap_display.display_on_epd(epd, _frame())
+    raspap_display.display_on_epd(epd, _frame())  # unchanged: skipped
+    assert epd.calls == ['full']
+
+    for i in range(limit + 1):
+        raspap_display.display_on_epd(epd, _frame(dot=i))
+    assert epd.calls == ['full'] + ['partial'] * limit + ['full']
+    assert raspap_display._partial_refresh_count == 0
+    assert inits == [raspap_display.EPD_FULL_UPDATE]
+
+    # A change covering most of the panel always gets a full refresh.
+    raspap_display.display_on_epd(epd, _frame(dot=0))
+    raspap_display.display_on_epd(
+        epd, _frame(fill_rows=raspap_display.UI_EPD_HEIGHT // 2 + 10))
+    assert epd.calls[-2:] == ['partial', 'full']
+
+    raspap_display.display_on_epd(
+        epd, _frame(fill_rows=raspap_display.UI_EPD_HEIGHT // 2 + 10),
+        full_refresh=True)
+    assert epd.calls[-1] == 'full'
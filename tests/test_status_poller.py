@@ -0,0 +1,28 @@
+import threading
+
+import raspap_display
+
+
+def test_status_poller_runs_and_wakes_main_loop(monkeypatch):
+    calls = {'stats': 0, 'poll': 0}
+    monkeypatch.setattr(raspap_display, 'PERIODIC_UPDATE_INTERVAL', 0.05)
+    monkeypatch.setattr(raspap_display, 'update_system_stats',
+                        lambda *a, **k: calls.__setitem__('stats', calls['stats'] + 1))
+    monkeypatch.setattr(raspap_display, 'poll_state',
+                        lambda *a, **k: calls.__setitem__('poll', calls['poll'] + 1))
+    raspap_display._stop_event.clear()
+    raspap_display._wake_event.clear()
+
+    pollers = []
+    raspap_display.start_status_poller()
+    try:
+        pollers = [t for t in threading.enumerate() if t.name == "status"]
+        assert pollers and pollers[0].is_alive()
+        assert raspap_display._wake_event.wait(2)
+        assert calls['stats'] >= 1 and calls['poll'] >= 1
+    finally:
+        raspap_display._stop_event.set()
+        for t in pollers:
+            t.join(2)
+        raspap_display._stop_event.clear()
+    assert not any(t.is_alive() for t in pollers)
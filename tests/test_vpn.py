@@ -0,0 +1,57 @@
+import pytest
+
+import raspap_display
+
+
+@pytest.mark.parametrize("returncode, output, expected", [
+    (0, "active\n\ninactive\n", {'a.service': 'active', 'b.service': 'inactive'}),
+    (0, "active\n", None),  # one value missing
+    (1, "active\n\ninactive\n", None),
+])
+def test_vpn_unit_states_from_one_systemctl_call(monkeypatch, returncode, output, expected):
+    calls = []
+
+    def fake_exec(argv, timeout=15):
+        calls.append(argv)
+        return returncode, output
+    monkeypatch.setattr(raspap_display, 'exec_command', fake_exec)
+
+    assert raspap_display.get_vpn_unit_states(['a.service', 'b.service']) == expected
+    assert calls == [["systemctl", "show", "-p", "ActiveState", "--value",
+                      "a.service", "b.service"]]
+    assert raspap_display.get_vpn_unit_states([]) == {}
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize("probed, published", [
+    ("VPN_OFF", "VPN_OFF"),
+    ("VPN_ERROR", "VPN_ERROR"),
+])
+def test_connect_vpn_failure_clears_the_active_vpn(monkeypatch, probed, published):
+    commands, messages, rechecks = [], [], []
+    monkeypatch.setattr(raspap_display, 'run_command',
+                        lambda argv, timeout=15: commands.append(argv) or "")
+    monkeypatch.setattr(raspap_display.time, 'sleep', lambda s: None)
+    monkeypatch.setattr(raspap_display, 'get_specific_vpn_service_status',
+                        lambda name: probed)
+    monkeypatch.setattr(raspap_display, 'display_message',
+                        lambda msg, **kw: messages.append(msg))
+    monkeypatch.setattr(raspap_display, 'update_vpn_status',
+                        lambda: rechecks.append(raspap_display.current_vpn_status))
+    monkeypatch.setattr(raspap_display, 'current_vpn_status', "VPN_OFF")
+    monkeypatch.setattr(raspap_display, 'current_vpn_config_basename', None)
+    monkeypatch.setattr(raspap_display, 'current_vpn_display_name', None)
+    monkeypatch.setattr(raspap_display, 'show_vpn_menu', True)
+    monkeypatch.setitem(raspap_display.system_stats_cache, 'geo_force', False)
+
+    raspap_display.connect_vpn({'name': "Office", 'config_basename_no_ext': "office",
+                                '_service_name': "wg-quick@office"})
+
+    assert commands == [["sudo", "systemctl", "start", "wg-quick@office"]]
+    assert messages == ["VPN: Connecting\nOffice", "VPN: Failed\nOffice"]
+    assert raspap_display.current_vpn_status == published
+    assert raspap_display.current_vpn_config_basename is None
+    assert raspap_display.current_vpn_display_name is None
+    assert rechecks == [published]
+    assert raspap_display.show_vpn_menu is True
+    assert raspap_display.system_stats_cache['geo_force'] is False